@@ -1,19 +1,38 @@
 import os
-from openai import OpenAI
 from dotenv import load_dotenv
 import json
 import re
 from typing import List, Dict
 import requests
-
-# 환경변수 로딩
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from location_merge import merge_location_rows
+from pipeline_context import PipelineContext
+from token_budget import select_relevant_text
+from ner_gate import gate_blogs
+from blog_dedup import BLOG_DEDUP_ENABLED, BLOG_DEDUP_WEIGHT_MENTIONS, NearDuplicateIndex, dedup_blogs
+from model_registry import get_initial_prompt
+from gpt_client import chat_completion
+from location_schema import (
+    location_response_format, parse_location_rows, rows_to_location_json, filter_clear_addresses,
+)
+
+# 환경변수 로딩 (OpenAI 클라이언트와 초기 프롬프트는 model_registry에서 처음 사용할 때 로딩, 호출은 gpt_client 경유)
 load_dotenv()
-api_key = os.getenv("OPENAI_API_KEY")
-client = OpenAI(api_key=api_key)
-ngrok_base = os.getenv("NGROK_URL")
-if not ngrok_base:
-    raise RuntimeError("NGROK_URL 환경변수가 설정되지 않았습니다.")
-ngrok_url = ngrok_base.rstrip("/") + "/crawl"
+
+
+def get_ngrok_url() -> str:
+    ngrok_base = os.getenv("NGROK_URL")
+    if not ngrok_base:
+        raise RuntimeError("NGROK_URL 환경변수가 설정되지 않았습니다.")
+    return ngrok_base.rstrip("/") + "/crawl"
+
+# ✅ GPT 단계 방식: sequential(누적 표 갱신) / map_reduce(블로그별 병렬 추출 후 로컬 병합)
+GPT_PIPELINE_MODE = os.getenv("GPT_PIPELINE_MODE", "sequential")
+GPT_MAP_CONCURRENCY = int(os.getenv("GPT_MAP_CONCURRENCY", "5"))
+GPT_CONSOLIDATE = os.getenv("GPT_CONSOLIDATE", "0") == "1"
+# ✅ 구조화 출력(JSON 스키마) 사용 여부, 0이면 기존 마크다운 표 + GPT 필터 방식
+GPT_STRUCTURED_OUTPUT = os.getenv("GPT_STRUCTURED_OUTPUT", "1") == "1"
 
 
 def get_blogs_from_local_crawler(movie_title: str, max_results: int = 30) -> list[dict]:
@@ -21,6 +40,7 @@ def get_blogs_from_local_crawler(movie_title: str, max_results: int = 30) -> lis
     로컬 크롤링 서버(ngrok 통해 열림)에 요청하여 영화 블로그 본문들을 받아옴
     """
 
+    ngrok_url = get_ngrok_url()
     payload = {
         "title": movie_title,
         "max_results": max_results
@@ -45,12 +65,44 @@ def get_blogs_from_local_crawler(movie_title: str, max_results: int = 30) -> lis
 
     return []
 
-# 초기 프롬프트 불러오기
-with open("초기_프롬프트.txt", "r", encoding="utf-8") as f:
-    initial_prompt = f.read()
+def iter_blogs_from_local_crawler(movie_title: str, max_results: int = 30):
+    """
+    로컬 크롤링 서버에 스트리밍(NDJSON)으로 요청해서 블로그가 추출되는 대로 하나씩 내보냄
+    - 연결이 끊기거나 실패하면 그때까지 받은 블로그까지만 내보내고 종료
+    - 잘리거나 깨진 줄(JSON 객체가 아닌 줄)은 건너뜀 (블로그 하나 실패가 전체를 멈추지 않도록)
+    """
+
+    ngrok_url = get_ngrok_url()
+    payload = {
+        "title": movie_title,
+        "max_results": max_results,
+        "stream": True
+    }
+
+    received = 0
+    try:
+        # timeout: (연결, 다음 데이터까지 대기) → 블로그 하나 추출에 걸리는 시간보다 넉넉하게
+        with requests.post(ngrok_url, json=payload, stream=True, timeout=(10, 600)) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                try:
+                    blog = json.loads(line)
+                except json.JSONDecodeError as e:
+                    print(f"[STREAM] 깨진 줄 건너뜀: {e} ({line[:80]!r})")
+                    continue
+                if not isinstance(blog, dict):
+                    print(f"[STREAM] JSON 객체가 아닌 줄 건너뜀: {line[:80]!r}")
+                    continue
+                received += 1
+                yield blog
+
+    except requests.exceptions.Timeout:
+        print(f"[TIMEOUT] ⏱ 크롤링 서버 응답 시간 초과: {ngrok_url} (받은 블로그 {received}개)")
 
-# 누적 장소정보 초기화
-accumulated_result = ""
+    except requests.exceptions.RequestException as req_err:
+        print(f"[REQUEST ERROR] ❌ 스트리밍 중 문제 발생: {req_err} (받은 블로그 {received}개)")
 
 # 📌 OpenAI 기반 필터링 + JSON 변환
 def clean_json_text(raw: str) -> str:
@@ -88,11 +140,15 @@ def filter_result_table_to_json(table_text: str) -> list:
         {"role": "user", "content": prompt.strip()}
     ]
 
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=messages,
-        temperature=0.2
-    )
+    try:
+        response = chat_completion(
+            model="gpt-4o",
+            messages=messages,
+            temperature=0.2
+        )
+    except Exception as e:
+        print(f"❌ GPT 필터 호출 실패: {e}")
+        return []
 
     raw_response = response.choices[0].message.content.strip()
     clean_text = clean_json_text(raw_response)
@@ -112,51 +168,290 @@ def compute_mention_rate(json_list: List[Dict], total_urls: int) -> List[Dict]:
         item["mentionRate"] = round(count / total_urls, 4) if total_urls > 0 else 0.0
     return json_list
 
+# 📌 구조화 출력 형식 안내 (초기 프롬프트의 10번 출력 형식 대신 사용)
+STRUCTURED_OUTPUT_INSTRUCTION = """
+[출력 형식 - 위 10번 대신 이 형식을 따라]
+- 결과는 지정된 JSON 스키마(locations 배열)로만 출력해. 지금까지 정리된 결과도 같은 JSON 형식으로 주어져.
+- keywords, extraInfo는 단어 단위 문자열 배열로 작성하고, 해당 내용이 없으면 빈 배열로 둬.
+"""
+
+# 📌 map 단계 안내 (블로그 하나만 보고 추출)
+MAP_OUTPUT_INSTRUCTION = """
+- 기존 결과 없이 이 블로그 본문 하나만 보고 장소를 추출해. 촬영 장소가 없으면 빈 배열을 출력해.
+"""
+
+def _message_content(response) -> str:
+    return (response.choices[0].message.content or "").strip()
+
 def process_single_blog(blog_text: str, accumulated_text: str, movie_title: str):
+    system_prompt = f"너는 블로그 본문에서 {movie_title} 영화 촬영 장소 정보를 정리하고 유지하는 전문가야." + get_initial_prompt()
+    options = {}
+    if GPT_STRUCTURED_OUTPUT:
+        system_prompt += STRUCTURED_OUTPUT_INSTRUCTION
+        options["response_format"] = location_response_format(with_mention_count=True)
+
     messages = [
-        {"role": "system", "content": f"너는 블로그 본문에서 {movie_title} 영화 촬영 장소 정보를 정리하고 유지하는 전문가야." + initial_prompt},
+        {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"""지금까지 정리된 결과는 다음과 같습니다:\n\n{accumulated_text}\n\n다음은 새로운 블로그 본문입니다:\n\n{blog_text}\n\n이 본문을 반영해서 결과를 **업데이트**하거나 **추가**해 주세요."""}
     ]
 
-    response = client.chat.completions.create(
+    response = chat_completion(
         model="gpt-4o",
         messages=messages,
-        temperature=0.2
+        temperature=0.2,
+        **options
     )
 
-    return response.choices[0].message.content.strip()
+    return _message_content(response)
 
-def run_pipeline(all_blogs, movie_title, save_to_file=False):
-    global accumulated_result
-    accumulated_result = ""  # 중요: API 요청마다 초기화
+# 📌 map 단계: 블로그 하나에서 장소 행 추출 (구조화 출력)
+def extract_blog_rows(blog_text: str, movie_title: str) -> list:
+    messages = [
+        {"role": "system", "content": f"너는 블로그 본문에서 {movie_title} 영화 촬영 장소 정보를 정리하는 전문가야." + get_initial_prompt() + STRUCTURED_OUTPUT_INSTRUCTION + MAP_OUTPUT_INSTRUCTION},
+        {"role": "user", "content": f"다음은 블로그 본문입니다:\n\n{blog_text}"}
+    ]
 
-    for i, blog_entry in enumerate(all_blogs, 1):
-        blog_text = blog_entry["본문"]
+    response = chat_completion(
+        model="gpt-4o",
+        messages=messages,
+        temperature=0.2,
+        response_format=location_response_format(with_mention_count=False)
+    )
 
-        if len(blog_text) > 10000:
-            print(f"[SKIP] {i}번 블로그 본문이 너무 깁니다. ({len(blog_text)}자) → 처리 제외됨")
-            continue  # 이 블로그는 GPT 처리에서 제외
-        
-        updated_result = process_single_blog(blog_text, accumulated_result, movie_title)
-        accumulated_result = updated_result
+    return parse_location_rows(_message_content(response))
 
-    filtered_json = filter_result_table_to_json(accumulated_result)
-    final_json = compute_mention_rate(filtered_json, total_urls=len(all_blogs))
+# 📌 (옵션) 병합된 장소 목록을 GPT로 한 번 더 정리 (표기만 다른 같은 장소 합치기)
+def consolidate_rows(rows: list, movie_title: str) -> list:
+    messages = [
+        {"role": "system", "content": f"너는 {movie_title} 영화 촬영 장소 목록을 정리하는 전문가야."},
+        {"role": "user", "content": f"""다음 장소 목록에서 장소명 표기만 다르고 같은 장소인 항목을 하나로 합쳐 주세요.
+- 합칠 때 mentionCount는 더하고, keywords와 extraInfo는 중복 없이 합칩니다.
+- 합칠 항목이 없으면 목록을 그대로 출력합니다.
 
-    print("🔥 GPT가 만든 테이블:")
-    print(accumulated_result)
+{rows_to_location_json(rows)}"""}
+    ]
+
+    response = chat_completion(
+        model="gpt-4o",
+        messages=messages,
+        temperature=0.2,
+        response_format=location_response_format(with_mention_count=True)
+    )
+
+    return parse_location_rows(_message_content(response))
+
+# 📌 블로그 본문을 토큰 예산 안으로 줄이기 (장소 관련 청크 우선) → 보낼 텍스트 (없으면 None)
+# - gate: ner_gate 판정 결과 (탈락이면 GPT 호출 생략, 청크별 LOC 개수는 청크 순위에 반영)
+def prepare_blog_text(ctx, i, blog_text, gate=None):
+    if gate is not None and not gate.passed:
+        print(f"[SKIP] {i}번 블로그 장소 정보 없음 (점수 {gate.score}) → GPT 호출 생략")
+        ctx.count("skipped_blogs")
+        return None
+    loc_counts = gate.loc_counts if gate is not None else None
+    selected, total_tokens, used_tokens = select_relevant_text(blog_text, loc_counts=loc_counts)
+    ctx.add_tokens(total_tokens, used_tokens)
+    if used_tokens < total_tokens:
+        print(f"[TOKENS] {i}번 블로그 {total_tokens} → {used_tokens} 토큰으로 축소")
+    return selected or None
+
+# 📌 언급 수를 유사 중복 묶음 크기로 가중하는지 (BLOG_DEDUP_WEIGHT_MENTIONS=1 이고 로컬에서 언급 수를 세는 map_reduce 일 때만)
+# - sequential/마크다운 표 방식은 GPT 가 대표 블로그 기준으로 언급 수를 세므로 가중치 없음
+def _weights_mentions(ctx):
+    return BLOG_DEDUP_WEIGHT_MENTIONS and ctx.mode == "map_reduce"
+
+# 📌 유사 중복 묶음 가중치 (가중하지 않으면 묶음당 한 번)
+def _mention_weights(ctx):
+    return ctx.cluster_sizes if _weights_mentions(ctx) else None
+
+# 📌 언급률 분모: 언급 수를 가중하면 중복 포함 전체 블로그 수, 아니면 대표 블로그 수 (분자와 같은 기준)
+def _mention_total(ctx):
+    if _weights_mentions(ctx):
+        return sum(ctx.cluster_sizes)
+    return sum(1 for size in ctx.cluster_sizes if size > 0)
+
+# 📌 지금까지의 장소 목록을 주소 필터 + 언급률 계산 후 잠정 결과로 전달 (스트리밍 응답용)
+def _publish_partial(ctx, rows):
+    if not ctx.on_partial:
+        return
+    partial = [dict(row) for row in filter_clear_addresses(rows)]
+    ctx.publish(compute_mention_rate(partial, _mention_total(ctx)))
+
+def _log_token_spend(ctx, blog_count):
+    print(f"[TOKENS] 블로그 {blog_count}개 본문 {ctx.token_log['original']} 토큰 중 {ctx.token_log['sent']} 토큰 전송")
+
+# 📌 sequential 한 단계: 누적 결과에 블로그 하나 반영
+def _sequential_step(ctx, i, blog_text):
+    ctx.count("gpt_calls")
+    try:
+        ctx.accumulated_result = process_single_blog(blog_text, ctx.accumulated_result, ctx.movie_title)
+        if GPT_STRUCTURED_OUTPUT:
+            _publish_partial(ctx, parse_location_rows(ctx.accumulated_result))
+    except Exception as e:
+        # 재시도 후에도 실패한 블로그는 건너뛰고 지금까지의 누적 결과 유지
+        ctx.count("gpt_failures")
+        print(f"[ERROR] {i}번 블로그 GPT 호출 실패: {e}")
+
+# 📌 sequential: 블로그마다 누적 결과를 넘겨 갱신 (블로그 수만큼 순차 호출)
+# - 구조화 출력 사용 시 누적 결과는 JSON, 아니면 마크다운 표
+# - 누적 결과는 요청별 ctx 에만 저장 (동시 요청끼리 섞이지 않음)
+def build_table_sequential(ctx, all_blogs, gates=None):
+    gates = gates or [None] * len(all_blogs)
+
+    for i, (blog_entry, gate) in enumerate(zip(all_blogs, gates), 1):
+        blog_text = prepare_blog_text(ctx, i, blog_entry["본문"], gate)
+        if blog_text:
+            _sequential_step(ctx, i, blog_text)
+        ctx.report("gpt", i, len(all_blogs))
+
+    _log_token_spend(ctx, len(all_blogs))
+    return ctx.accumulated_result
+
+# 📌 map 단계 결과 수집 → 블로그 순서대로 병합 (futures: {future: 블로그 번호})
+def _reduce_map_results(ctx, futures, blog_count, done):
+    rows_per_blog = [[] for _ in range(blog_count)]
+    ctx.count("gpt_calls", len(futures))
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            rows_per_blog[i - 1] = future.result()
+            _publish_partial(ctx, merge_location_rows(rows_per_blog, _mention_weights(ctx)))
+        except Exception as e:
+            ctx.count("gpt_failures")
+            print(f"[ERROR] {i}번 블로그 GPT 추출 실패: {e}")
+        done += 1
+        ctx.report("gpt", done, blog_count)
+
+    merged_rows = merge_location_rows(rows_per_blog, _mention_weights(ctx))
+    print(f"[MAP] 블로그 {len(futures)}개 → 병합 후 장소 {len(merged_rows)}개")
+    if GPT_CONSOLIDATE and merged_rows:
+        ctx.count("gpt_calls")
+        try:
+            merged_rows = consolidate_rows(merged_rows, ctx.movie_title)
+        except Exception as e:
+            ctx.count("gpt_failures")
+            print(f"[ERROR] GPT 통합 단계 실패 → 병합 결과 그대로 사용: {e}")
+    return merged_rows
+
+# 📌 map_reduce: 블로그별 추출을 병렬로 돌리고 파이썬에서 병합
+def build_rows_map_reduce(ctx, all_blogs, gates=None):
+    gates = gates or [None] * len(all_blogs)
+    targets = [
+        (i, prepare_blog_text(ctx, i, blog_entry["본문"], gate))
+        for i, (blog_entry, gate) in enumerate(zip(all_blogs, gates), 1)
+    ]
+    targets = [(i, blog_text) for i, blog_text in targets if blog_text]
+    _log_token_spend(ctx, len(all_blogs))
+
+    with ThreadPoolExecutor(max_workers=GPT_MAP_CONCURRENCY) as executor:
+        futures = {executor.submit(extract_blog_rows, blog_text, ctx.movie_title): i for i, blog_text in targets}
+        return _reduce_map_results(ctx, futures, len(all_blogs), len(all_blogs) - len(targets))
+
+# 📌 GPT 결과 → 주소 필터 + 언급률 (구조화 출력이면 rows, 마크다운 표 방식이면 table_text)
+def _finalize(ctx, rows, table_text, save_to_file):
+    with ctx.timed("filter"):
+        if rows is not None:
+            filtered_json = filter_clear_addresses(rows)
+        else:
+            filtered_json = filter_result_table_to_json(table_text)
+        final_json = compute_mention_rate(filtered_json, total_urls=_mention_total(ctx))
+    ctx.report("filter", 1, 1)
+
+    print("🔥 GPT가 만든 결과:")
+    print(table_text if rows is None else json.dumps(rows, ensure_ascii=False))
+    print(f"[PIPELINE] {ctx.summary()}")
 
     if save_to_file:
-        output_path = f"{movie_title}_result.json"
+        output_path = f"{ctx.movie_title}_result.json"
         with open(output_path, "w", encoding="utf-8") as f:
             json.dump(filtered_json, f, ensure_ascii=False, indent=2)
 
     return filtered_json
 
+def run_pipeline(all_blogs, movie_title, save_to_file=False, progress=None, mode=None, ctx=None):
+    """
+    progress(stage, done, total): 진행 상황 콜백 (gpt / filter)
+    mode: "sequential" 또는 "map_reduce" (기본값은 GPT_PIPELINE_MODE 환경변수)
+    ctx: 요청별 PipelineContext (없으면 새로 만듦, 호출 후 ctx.summary() 로 토큰/횟수/소요시간 확인)
+    - 구조화 출력(기본)은 주소 필터를 파이썬에서 적용하고, 마크다운 표 방식일 때만 GPT 필터 호출
+    - GPT 단계 전에 유사 중복 블로그를 묶어 대표 하나만 보냄 (묶음 크기는 ctx.cluster_sizes)
+    """
+    ctx = ctx or PipelineContext(movie_title, mode or GPT_PIPELINE_MODE, progress)
+    with ctx.timed("dedup"):
+        original_count = len(all_blogs)
+        all_blogs, ctx.cluster_sizes = dedup_blogs(all_blogs)
+        ctx.count("duplicate_blogs", original_count - len(all_blogs))
+    with ctx.timed("gate"):
+        gates = gate_blogs([blog_entry["본문"] for blog_entry in all_blogs])
+    table_text = None
+    with ctx.timed("gpt"):
+        if ctx.mode == "map_reduce":
+            rows = build_rows_map_reduce(ctx, all_blogs, gates)
+        elif GPT_STRUCTURED_OUTPUT:
+            rows = parse_location_rows(build_table_sequential(ctx, all_blogs, gates))
+        else:
+            rows = None
+            table_text = build_table_sequential(ctx, all_blogs, gates)
+    print(f"[⏱] GPT 단계 ({ctx.mode}): {ctx.timings['gpt']:.2f}s")
+
+    return _finalize(ctx, rows, table_text, save_to_file)
+
+# 📌 스트리밍: 도착한 블로그 하나를 유사 중복 확인 → NER 게이트 → 토큰 예산 순으로 처리 → 보낼 텍스트 (없으면 None)
+def _prepare_arrival(ctx, dedup_index, i, blog_entry):
+    ctx.cluster_sizes.append(1)
+    if dedup_index is not None:
+        rep = dedup_index.add(blog_entry["본문"])
+        if rep != i - 1:
+            ctx.cluster_sizes[-1] = 0
+            ctx.cluster_sizes[rep] += 1
+            ctx.count("duplicate_blogs")
+            print(f"[DEDUP] {i}번 블로그는 {rep + 1}번과 유사 중복 → GPT 호출 생략")
+            return None
+    gate = gate_blogs([blog_entry["본문"]])[0]
+    return prepare_blog_text(ctx, i, blog_entry["본문"], gate)
+
+def run_pipeline_streaming(blog_iter, movie_title, save_to_file=False, progress=None, mode=None, ctx=None):
+    """
+    run_pipeline 과 같지만 블로그가 도착하는 대로 GPT 단계를 진행 (크롤링과 GPT 호출 시간이 겹침)
+    - blog_iter: {"url", "본문"} 을 하나씩 내보내는 iterable (예: iter_blogs_from_local_crawler)
+    - 유사 중복/NER 게이트는 블로그마다 따로 판정, map_reduce 는 도착 즉시 GPT 호출을 제출
+    - 전체 블로그 수를 미리 모르므로 gpt 진행 상황의 total 은 지금까지 받은 블로그 수
+    """
+    ctx = ctx or PipelineContext(movie_title, mode or GPT_PIPELINE_MODE, progress)
+    dedup_index = NearDuplicateIndex() if BLOG_DEDUP_ENABLED else None
+    blog_count = 0
+    table_text = None
+    rows = None
+    with ctx.timed("crawl+gpt"):
+        if ctx.mode == "map_reduce":
+            with ThreadPoolExecutor(max_workers=GPT_MAP_CONCURRENCY) as executor:
+                futures = {}
+                for i, blog_entry in enumerate(blog_iter, 1):
+                    blog_count = i
+                    blog_text = _prepare_arrival(ctx, dedup_index, i, blog_entry)
+                    if blog_text:
+                        futures[executor.submit(extract_blog_rows, blog_text, ctx.movie_title)] = i
+                _log_token_spend(ctx, blog_count)
+                rows = _reduce_map_results(ctx, futures, blog_count, blog_count - len(futures))
+        else:
+            for i, blog_entry in enumerate(blog_iter, 1):
+                blog_count = i
+                blog_text = _prepare_arrival(ctx, dedup_index, i, blog_entry)
+                if blog_text:
+                    _sequential_step(ctx, i, blog_text)
+                ctx.report("gpt", i, i)
+            _log_token_spend(ctx, blog_count)
+            if GPT_STRUCTURED_OUTPUT:
+                rows = parse_location_rows(ctx.accumulated_result)
+            else:
+                table_text = ctx.accumulated_result
+    print(f"[⏱] 크롤링+GPT 단계 ({ctx.mode}): {ctx.timings['crawl+gpt']:.2f}s")
+
+    return _finalize(ctx, rows, table_text, save_to_file)
+
 # 테스트 실행 예시
 if __name__ == "__main__":
-    blogs = get_blogs_from_local_crawler("중경삼림", max_results=30)
-    final_output = run_pipeline(blogs, "중경삼림")
+    blogs = iter_blogs_from_local_crawler("중경삼림", max_results=30)
+    final_output = run_pipeline_streaming(blogs, "중경삼림")
     print("\n📦 최종 결과:")
     print(final_output)
     print(len(final_output))
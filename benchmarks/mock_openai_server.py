@@ -0,0 +1,169 @@
+"""
+오프라인 벤치마크용 chat completions 모의 서버 (표준 라이브러리만 사용)
+- POST /v1/chat/completions 에 응답 지연(latency ± jitter)을 준 뒤 준비된 장소 응답을 돌려줌
+- 응답 장소: fixtures/offline/openai_responses.json 의 각 항목 중 "match" 키워드가
+  마지막 user 메시지에 들어 있는 항목 (없으면 빈 목록)
+- response_format 이 있으면 요청 스키마의 필드만 담은 {"locations": [...]} JSON,
+  없으면 필터 프롬프트(JSON 리스트 요청)에는 JSON 리스트, 그 외에는 마크다운 표
+- error_rate 비율만큼 429 + Retry-After 로 응답 (재시도/백오프 경로 측정용)
+- 단독 실행: python benchmarks/mock_openai_server.py --port 8011 --latency-ms 800
+  → OPENAI_BASE_URL=http://127.0.0.1:8011/v1 로 서버/스크립트 실행
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from location_schema import FIELD_NAMES
+
+DEFAULT_RESPONSES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "offline", "openai_responses.json")
+
+
+def load_responses(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["locations"]
+
+
+def match_locations(responses, text):
+    return [entry for entry in responses if any(keyword in text for keyword in entry["match"])]
+
+
+def _location_fields(entry, fields):
+    location = {"mentionCount": 1, **{key: value for key, value in entry.items() if key != "match"}}
+    return {field: location.get(field, "") for field in fields}
+
+
+# ✅ 요청 형식에 맞춘 응답 본문 생성
+def render_content(request, locations):
+    response_format = request.get("response_format")
+    if response_format:
+        item = response_format["json_schema"]["schema"]["properties"]["locations"]["items"]
+        return json.dumps({"locations": [_location_fields(entry, item["required"]) for entry in locations]}, ensure_ascii=False)
+
+    columns = list(FIELD_NAMES.values())
+    rows = [{FIELD_NAMES[key]: value for key, value in _location_fields(entry, FIELD_NAMES).items()} for entry in locations]
+    prompt = request["messages"][-1]["content"]
+    if "JSON 리스트" in prompt:
+        return json.dumps(rows, ensure_ascii=False)
+
+    def cell(value):
+        return ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(cell(row[column]) for column in columns) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, responses, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        super().__init__(address, MockOpenAIHandler)
+        self.responses = responses
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "rate_limited": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def record(self, **counts):
+        with self._lock:
+            for key, value in counts.items():
+                self.stats[key] += value
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.stats)
+
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", "0"))) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+
+        delay = max(0.0, server.latency_ms + random.uniform(-server.jitter_ms, server.jitter_ms)) / 1000
+        time.sleep(delay)
+        if server.error_rate and random.random() < server.error_rate:
+            server.record(requests=1, rate_limited=1)
+            self._send_json(429, {"error": {"message": "Rate limit reached (mock)", "type": "rate_limit_error"}}, {"Retry-After": "0.2"})
+            return
+
+        prompt_text = "".join(str(message.get("content", "")) for message in request.get("messages", []))
+        last_user = next((m["content"] for m in reversed(request.get("messages", [])) if m.get("role") == "user"), "")
+        content = render_content(request, match_locations(server.responses, last_user))
+        # 토큰 수는 한국어 기준 대략 글자 수 / 2 로 추정
+        usage = {"prompt_tokens": len(prompt_text) // 2, "completion_tokens": len(content) // 2}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        server.record(requests=1, prompt_tokens=usage["prompt_tokens"], completion_tokens=usage["completion_tokens"])
+
+        self._send_json(200, {
+            "id": f"chatcmpl-mock-{random.getrandbits(48):012x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+                "logprobs": None,
+            }],
+            "usage": usage,
+        })
+
+
+# ✅ 백그라운드 스레드에서 서버 시작 (port=0 이면 빈 포트 자동 선택) → 서버 객체
+def start_mock_server(host="127.0.0.1", port=0, responses_path=DEFAULT_RESPONSES, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+    server = MockOpenAIServer((host, port), load_responses(responses_path), latency_ms, jitter_ms, error_rate)
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="chat completions 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--responses", default=DEFAULT_RESPONSES)
+    parser.add_argument("--latency-ms", type=float, default=800)
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockOpenAIServer((args.host, args.port), load_responses(args.responses), args.latency_ms, args.jitter_ms, args.error_rate)
+    print(f"🧪 모의 OpenAI 서버: {server.base_url} (지연 {args.latency_ms}±{args.jitter_ms}ms, 429 비율 {args.error_rate})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n종료 - {server.snapshot()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+NER 추론 벤치마크
+- 고정 로컬 코퍼스(fixtures/ner_corpus.jsonl)에 대해 기존 fp32 파이프라인(윈도우 없음)과
+  ner_inference 백엔드(fp32/int8/onnx, 윈도우+배치)의 처리량(docs/sec)과 개체 일치율을 비교
+- 실행: python benchmarks/ner_benchmark.py --backends fp32 int8 onnx --repeat 3
+"""
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ner_inference import BACKENDS, NER_BATCH_SIZE, load_ner_pipeline, entity_set
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "ner_corpus.jsonl")
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+# ✅ 기존 방식: 문서마다 한 번씩 전체 텍스트로 호출 (긴 문서는 실패할 수 있음 → 빈 결과로 기록)
+def run_baseline(ner, texts):
+    results, failures = [], 0
+    for text in texts:
+        try:
+            results.append(ner(text))
+        except Exception:
+            results.append([])
+            failures += 1
+    return results, failures
+
+
+def run_batched(ner, texts, batch_size):
+    return ner(texts, batch_size=batch_size), 0
+
+
+def measure(run, repeat):
+    best = None
+    results = failures = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results, failures = run()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return results, failures, best
+
+
+# ✅ 개체 단위 일치율: 기준선 대비 precision / recall / F1 (문서별 (그룹, 단어) 집합 합산)
+def agreement(reference, candidate, groups):
+    matched = ref_total = cand_total = 0
+    for ref_entities, cand_entities in zip(reference, candidate):
+        ref = entity_set(ref_entities, groups)
+        cand = entity_set(cand_entities, groups)
+        matched += len(ref & cand)
+        ref_total += len(ref)
+        cand_total += len(cand)
+    precision = matched / cand_total if cand_total else 1.0
+    recall = matched / ref_total if ref_total else 1.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NER 백엔드 처리량/일치율 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=NER_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--groups", nargs="*", default=None, help="비교할 개체 그룹 (기본: 전체)")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    print(f"📂 코퍼스: {args.corpus} ({len(texts)}개 문서)")
+
+    baseline = load_ner_pipeline("fp32", windowed=False)
+    reference, failures, elapsed = measure(lambda: run_baseline(baseline, texts), args.repeat)
+    print(f"\n{'backend':<16}{'docs/sec':>10}{'fail':>6}{'P':>8}{'R':>8}{'F1':>8}")
+    print(f"{'baseline-fp32':<16}{len(texts) / elapsed:>10.2f}{failures:>6}{'-':>8}{'-':>8}{'-':>8}")
+
+    for backend in args.backends:
+        ner = load_ner_pipeline(backend)
+        results, failures, elapsed = measure(lambda: run_batched(ner, texts, args.batch_size), args.repeat)
+        precision, recall, f1 = agreement(reference, results, args.groups)
+        print(f"{backend:<16}{len(texts) / elapsed:>10.2f}{failures:>6}{precision:>8.3f}{recall:>8.3f}{f1:>8.3f}")
+
+    print("\n※ 기준선이 실패한(빈 결과) 긴 문서에서 윈도우 방식이 찾은 개체는 precision 을 낮추는 쪽으로 집계됨")
+
+
+if __name__ == "__main__":
+    main()
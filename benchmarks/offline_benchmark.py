@@ -0,0 +1,297 @@
+"""
+오프라인 종단 간 벤치마크 (네이버/Chrome/Tesseract/OpenAI 없이 실행)
+- 녹화 데이터(fixtures/offline, offline_replay 참고)와 로컬 chat completions 모의 서버(mock_openai_server)로
+  아래 세 단계를 동시 요청 수별로 측정
+  · crawl: extract_all_info_from_movie (검색 → 본문 → OCR, 단계별 완료 시점)
+  · pipeline: run_pipeline (모드별, PipelineContext 의 dedup / gate / gpt / filter 소요시간)
+  · endpoint: POST /movies (FastAPI TestClient, lifespan 포함)
+- 보고 항목: 호출당 지연(p50/p95/max), 처리량(호출/초, 블로그/초), 단계별 시간, 메모리(tracemalloc 최대치, 최대 RSS)
+- 결과/로컬 캐시는 항상 끔 (반복 측정이 캐시 적중으로 바뀌지 않도록), 그 외 설정은 환경변수로 조정
+- 실행: python benchmarks/offline_benchmark.py --concurrency 1 2 4 --output bench.json
+  비교: python benchmarks/offline_benchmark.py --baseline bench.json --fail-threshold 0.15
+  (기준 대비 p50 지연이 15% 넘게 늘어난 항목이 있으면 종료 코드 1)
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import platform
+import subprocess
+import tracemalloc
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows 에는 resource 모듈이 없음 → 최대 RSS 생략
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from mock_openai_server import DEFAULT_RESPONSES, start_mock_server
+
+DEFAULT_FIXTURES = os.path.join(BENCH_DIR, "fixtures", "offline")
+SCENARIOS = ["crawl", "pipeline", "endpoint"]
+
+# ✅ 오프라인 실행 기본 설정 (이미 지정한 환경변수는 유지)
+# - NER 게이트는 모델 다운로드가 필요해서 기본 off, GPT 분당 한도는 계정 속성이라 기본 무제한(0)
+# - 토큰 수는 글자 수 추정 사용 (tiktoken 은 처음 쓸 때 BPE 파일을 내려받으므로 오프라인에서 쓸 수 없음)
+# - 녹화 페이지는 높이/개수가 변하지 않으므로 스크롤·안정화 대기는 짧게 (네트워크 지연은 --page-latency-ms)
+OFFLINE_ENV = {
+    "NER_GATE_MODE": "off",
+    "TOKEN_COUNTER": "chars",
+    "MODEL_WARMUP": "",
+    "GPT_REQUESTS_PER_MINUTE": "0",
+    "GPT_TOKENS_PER_MINUTE": "0",
+    "SCROLL_SETTLE_TIMEOUT": "0.05",
+    "STABLE_COUNT_DURATION": "0.05",
+    "WAIT_POLL_INTERVAL": "0.01",
+    "USE_NAVER_HTTP": "1",
+}
+CACHE_SWITCHES = ["RESULT_CACHE", "PAGE_CACHE", "OCR_CACHE", "SEARCH_CACHE", "LLM_CACHE"]
+
+
+def configure_environment(base_url, work_dir):
+    for key, value in OFFLINE_ENV.items():
+        os.environ.setdefault(key, value)
+    for key in CACHE_SWITCHES:
+        os.environ[key] = "0"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "sk-offline-benchmark"
+    os.environ["JOB_STORE_PATH"] = os.path.join(work_dir, "jobs.sqlite3")
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def max_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024  # macOS 는 바이트, Linux 는 KB
+
+
+# ✅ 동시 요청 수 level 로 level * repeat 번 호출 → 요약
+# - call(payload) 는 {"seconds", "items", "stages"} 를 돌려줌
+def run_level(call, payloads, level, repeat):
+    jobs = [payloads[i % len(payloads)] for i in range(level * repeat)]
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=level) as executor:
+        results = list(executor.map(call, jobs))
+    wall = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+
+    latencies = [r["seconds"] for r in results]
+    stages = {}
+    for r in results:
+        for stage, seconds in r["stages"].items():
+            stages.setdefault(stage, []).append(seconds)
+    return {
+        "concurrency": level,
+        "calls": len(results),
+        "wallSeconds": round(wall, 3),
+        "callsPerSecond": round(len(results) / wall, 3),
+        "blogsPerSecond": round(sum(r["items"] for r in results) / wall, 3),
+        "latency": {
+            "p50": round(percentile(latencies, 0.5), 3),
+            "p95": round(percentile(latencies, 0.95), 3),
+            "max": round(max(latencies), 3),
+        },
+        "stages": {stage: round(sum(values) / len(values), 3) for stage, values in stages.items()},
+        "peakTracedMB": round(peak / (1024 * 1024), 1),
+        "maxRssMB": None if max_rss_mb() is None else round(max_rss_mb(), 1),
+    }
+
+
+# ✅ 측정 대상별 호출 함수 (저장소 모듈은 환경변수 설정 후에 import)
+def crawl_call(max_results):
+    from extract_movie import extract_all_info_from_movie
+
+    def call(movie):
+        marks = {}
+        start = time.perf_counter()
+
+        def progress(stage, done, total):
+            marks[stage] = time.perf_counter() - start  # 단계별 마지막 완료 시점
+
+        blogs = extract_all_info_from_movie(movie["title"], max_results=max_results, progress=progress)
+        return {"seconds": time.perf_counter() - start, "items": len(blogs), "stages": marks}
+
+    return call
+
+
+def pipeline_call(blogs_by_title, mode):
+    from analyze_with_gpt import run_pipeline
+    from pipeline_context import PipelineContext
+
+    def call(movie):
+        blogs = blogs_by_title[movie["title"]]
+        ctx = PipelineContext(movie["title"], mode)
+        start = time.perf_counter()
+        run_pipeline(blogs, movie["title"], mode=mode, ctx=ctx)
+        return {"seconds": time.perf_counter() - start, "items": len(blogs), "stages": dict(ctx.timings)}
+
+    return call
+
+
+def endpoint_call(client):
+    def call(movie):
+        payload = {key: movie[key] for key in ("id", "title", "director", "releaseDate")}
+        start = time.perf_counter()
+        response = client.post("/movies", json=payload)
+        seconds = time.perf_counter() - start
+        body = response.json()
+        if response.status_code != 200 or "locations" not in body:
+            raise RuntimeError(f"/movies 실패 ({response.status_code}): {body}")
+        return {"seconds": seconds, "items": len(body["locations"]), "stages": {}}
+
+    return call
+
+
+def print_report(results):
+    print(f"\n{'항목':<28}{'호출':>6}{'총(s)':>9}{'호출/s':>9}{'블로그/s':>10}{'p50':>8}{'p95':>8}{'메모리MB':>10}  단계(평균 s)")
+    for key, summary in results.items():
+        stages = " ".join(f"{stage}={seconds}" for stage, seconds in summary["stages"].items())
+        print(f"{key:<28}{summary['calls']:>6}{summary['wallSeconds']:>9.2f}{summary['callsPerSecond']:>9.2f}"
+              f"{summary['blogsPerSecond']:>10.2f}{summary['latency']['p50']:>8.2f}{summary['latency']['p95']:>8.2f}"
+              f"{summary['peakTracedMB']:>10.1f}  {stages}")
+
+
+# ✅ 기준 결과와 비교 (p50 지연 / 처리량 / 메모리 변화율) → 지연이 threshold 넘게 늘어난 항목 목록
+def compare_with_baseline(results, baseline_path, threshold):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    def change(new, old):
+        return (new - old) / old if old else 0.0
+
+    regressions = []
+    print(f"\n📊 기준 비교: {baseline_path}")
+    print(f"{'항목':<28}{'p50 변화':>10}{'처리량 변화':>12}{'메모리 변화':>12}")
+    for key, summary in results.items():
+        if key not in baseline:
+            continue
+        old = baseline[key]
+        latency = change(summary["latency"]["p50"], old["latency"]["p50"])
+        throughput = change(summary["callsPerSecond"], old["callsPerSecond"])
+        memory = change(summary["peakTracedMB"], old["peakTracedMB"])
+        flag = ""
+        if threshold is not None and latency > threshold:
+            regressions.append(key)
+            flag = "  ❌"
+        print(f"{key:<28}{latency:>+10.1%}{throughput:>+12.1%}{memory:>+12.1%}{flag}")
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 종단 간 벤치마크")
+    parser.add_argument("--fixtures", default=DEFAULT_FIXTURES)
+    parser.add_argument("--responses", default=DEFAULT_RESPONSES)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=2, help="동시 요청 수마다 반복 횟수 (호출 수 = 동시 요청 수 x 반복)")
+    parser.add_argument("--modes", nargs="+", choices=["sequential", "map_reduce"], default=["sequential", "map_reduce"])
+    parser.add_argument("--max-results", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=800, help="모의 OpenAI 응답 지연")
+    parser.add_argument("--jitter-ms", type=float, default=200)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="모의 OpenAI 429 응답 비율")
+    parser.add_argument("--page-latency-ms", type=float, default=150, help="페이지/이미지 요청 한 번당 지연")
+    parser.add_argument("--ocr", choices=["replay", "tesseract"], default="replay",
+                        help="replay: 녹화된 OCR 텍스트 / tesseract: 녹화된 이미지로 실제 OCR")
+    parser.add_argument("--ocr-latency-ms", type=float, default=400, help="replay 모드의 이미지당 OCR 시간")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--fail-threshold", type=float, help="p50 지연 증가율이 이 값을 넘으면 종료 코드 1")
+    parser.add_argument("--quiet", action="store_true", help="파이프라인 로그(print) 숨김")
+    args = parser.parse_args()
+
+    server = start_mock_server(
+        responses_path=args.responses, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate
+    )
+    work_dir = tempfile.mkdtemp(prefix="offline-bench-")
+    configure_environment(server.base_url, work_dir)
+
+    from offline_replay import FixtureStore, install_replay
+    from extract_movie import extract_all_info_from_movie
+    from gpt_client import get_gpt_metrics
+
+    store = FixtureStore(args.fixtures)
+    install_replay(store, args.page_latency_ms / 1000, args.ocr, args.ocr_latency_ms / 1000)
+    print(f"🧪 모의 OpenAI: {server.base_url} / 녹화 데이터: {args.fixtures} (영화 {len(store.movies)}개)")
+
+    log_sink = open(os.devnull, "w", encoding="utf-8") if args.quiet else None
+    quiet = (lambda: contextlib.redirect_stdout(log_sink)) if args.quiet else contextlib.nullcontext
+
+    tracemalloc.start()
+    results = {}
+
+    def measure(key, call):
+        with quiet():
+            call(store.movies[0])  # 워밍업 (드라이버 풀/실행기/클라이언트 지연 생성)
+            for level in args.concurrency:
+                results[f"{key}@{level}"] = run_level(call, store.movies, level, args.repeat)
+        print(f"[⏱] {key}: 동시 요청 {args.concurrency} 측정 완료")
+
+    if "crawl" in args.scenarios:
+        measure("crawl", crawl_call(args.max_results))
+
+    if "pipeline" in args.scenarios:
+        with quiet():
+            blogs_by_title = {m["title"]: extract_all_info_from_movie(m["title"], max_results=args.max_results) for m in store.movies}
+        for mode in args.modes:
+            measure(f"pipeline[{mode}]", pipeline_call(blogs_by_title, mode))
+
+    if "endpoint" in args.scenarios:
+        from fastapi.testclient import TestClient
+        import main as app_main
+
+        with TestClient(app_main.app) as client:
+            measure("endpoint[/movies]", endpoint_call(client))
+
+    tracemalloc.stop()
+    print_report(results)
+    print(f"\n모의 OpenAI 요청: {server.snapshot()}")
+    print(f"GPT 클라이언트: {get_gpt_metrics()}")
+
+    report = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "settings": {
+            **{key: value for key, value in vars(args).items() if key not in ("output", "baseline", "fail_threshold", "quiet")},
+            **{key: os.environ.get(key) for key in OFFLINE_ENV},
+        },
+        "mockOpenAI": server.snapshot(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"💾 결과 저장: {args.output}")
+
+    regressions = compare_with_baseline(results, args.baseline, args.fail_threshold) if args.baseline else []
+    server.shutdown()
+    if regressions:
+        print(f"\n❌ 기준 대비 지연 증가: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+오프라인 벤치마크용 녹화 데이터 재생 (fixtures/offline)
+- manifest.json 에 적힌 검색 결과 페이지 / 블로그·기사 HTML / 이미지(+녹화된 OCR 텍스트)를
+  실제 네트워크·Chrome·Tesseract 대신 돌려줌
+- install_replay() 는 벤치마크 프로세스 안에서만 바깥과 통신하는 지점을 바꿔 끼움
+  · driver_pool.create_driver → ReplayDriver (검색 페이지 스크롤/대기, 네이버 mainFrame 전환까지 그대로 실행)
+  · extract_movie.fetch_postview(s) → 녹화된 PostView 문서 (asyncio 동시 요청 구조는 유지)
+  · ocr_stage.download_image → 녹화된 이미지 파일 (사전 검사 + Tesseract 는 실제로 실행)
+  · ocr="replay" 이면 extract_movie.extract_text_from_images → 녹화된 OCR 텍스트 (Tesseract 없이 실행)
+"""
+import os
+import json
+import math
+import time
+import asyncio
+from urllib.parse import urlparse, parse_qs
+from lxml import html as lxml_html
+
+import ocr_stage
+import driver_pool
+import extract_movie
+from naver_http import PostViewDocument, FAILED_DOCUMENT
+from page_extract import NAVER_BODY_SELECTORS, GENERAL_BODY_SELECTORS
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "offline")
+
+EMPTY_SEARCH_PAGE = "<html><body><ul class='lst_view'></ul></body></html>"
+SELECTOR_XPATHS = dict(NAVER_BODY_SELECTORS + GENERAL_BODY_SELECTORS)
+SELECTOR_XPATHS["a.link_tit"] = "//a[contains(concat(' ', normalize-space(@class), ' '), ' link_tit ')]"
+
+
+class FixtureStore:
+    """
+    manifest.json 형식
+    - movies: [{"id", "title", "director", "releaseDate"}]
+    - search: {검색어: [1페이지 HTML 경로, 2페이지 ...]} (없는 검색어/페이지는 결과 없음)
+    - pages: {URL: HTML 경로} (네이버 블로그는 PostView 문서)
+    - images: {이미지 URL: {"file": 이미지 경로, "text": 녹화된 OCR 텍스트}}
+    """
+
+    def __init__(self, root=DEFAULT_FIXTURES):
+        self.root = root
+        with open(os.path.join(root, "manifest.json"), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        self.movies = manifest["movies"]
+        self.search = manifest.get("search", {})
+        self.pages = manifest.get("pages", {})
+        self.images = manifest.get("images", {})
+        self._files = {}
+
+    def _read(self, relative_path, binary=False):
+        key = (relative_path, binary)
+        if key not in self._files:
+            with open(os.path.join(self.root, relative_path), "rb" if binary else "r", **({} if binary else {"encoding": "utf-8"})) as f:
+                self._files[key] = f.read()
+        return self._files[key]
+
+    def search_page(self, query, start):
+        pages = self.search.get(query, [])
+        page_index = (start - 1) // 10
+        return self._read(pages[page_index]) if page_index < len(pages) else EMPTY_SEARCH_PAGE
+
+    def page_html(self, url):
+        path = self.pages.get(url) or self.pages.get(extract_movie.normalize_url(url))
+        return self._read(path) if path else None
+
+    def image_bytes(self, url):
+        entry = self.images.get(url)
+        return self._read(entry["file"], binary=True) if entry and entry.get("file") else None
+
+    def ocr_text(self, url):
+        entry = self.images.get(url)
+        return entry.get("text", "") if entry else ""
+
+
+class _Element:
+    def __init__(self, element):
+        self._element = element
+
+    def get_attribute(self, name):
+        return self._element.get(name)
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def default_content(self):
+        self._driver._frame_html = None
+
+    def frame(self, reference):
+        self._driver._switch_frame(reference)
+
+
+class ReplayDriver:
+    """
+    Selenium WebDriver 대신 녹화된 HTML을 돌려주는 드라이버 (page_wait / extract_movie 가 쓰는 메서드만 구현)
+    - 네이버 블로그 URL은 mainFrame iframe 만 있는 껍데기 페이지 → frame 전환 시 녹화된 PostView 문서
+    - page_latency: driver.get() 한 번당 지연 (초)
+    """
+
+    def __init__(self, store, page_latency=0.0):
+        self.store = store
+        self.page_latency = page_latency
+        self.switch_to = _SwitchTo(self)
+        self._html = EMPTY_SEARCH_PAGE
+        self._frame_html = None
+        self._frame_url = None
+        self._tree = None
+
+    def get(self, url):
+        time.sleep(self.page_latency)
+        self._frame_html = None
+        self._tree = None
+        parsed = urlparse(url)
+        if parsed.netloc == "search.naver.com":
+            query = parse_qs(parsed.query)
+            self._html = self.store.search_page(query.get("query", [""])[0], int(query.get("start", ["1"])[0]))
+        elif parsed.netloc.endswith("blog.naver.com"):
+            self._frame_url = url
+            self._html = "<html><body><iframe id='mainFrame' name='mainFrame' src='about:blank'></iframe></body></html>"
+        else:
+            self._html = self.store.page_html(url) or "<html><body></body></html>"
+
+    def _switch_frame(self, reference):
+        # page_wait.wait_for_frame 은 재시도하므로 녹화가 없으면 NoSuchFrameException 대신 빈 문서로 전환
+        if reference == "mainFrame" and self._frame_url:
+            self._frame_html = self.store.page_html(self._frame_url) or "<html><body></body></html>"
+            self._tree = None
+
+    @property
+    def page_source(self):
+        return self._frame_html if self._frame_html is not None else self._html
+
+    def find_elements(self, by, selector):
+        if self._tree is None:
+            self._tree = lxml_html.fromstring(self.page_source)
+        xpath = SELECTOR_XPATHS.get(selector)
+        return [_Element(e) for e in self._tree.xpath(xpath)] if xpath else []
+
+    def execute_script(self, script, *args):
+        if "readyState" in script:
+            return "complete"
+        if "scrollHeight" in script and script.strip().startswith("return"):
+            return 1000
+        return None
+
+    def set_page_load_timeout(self, timeout):
+        pass
+
+    def quit(self):
+        pass
+
+
+# ✅ 바깥과 통신하는 지점을 녹화 재생으로 교체 (벤치마크 프로세스 안에서만)
+def install_replay(store, page_latency=0.0, ocr="replay", ocr_latency=0.0):
+    def create_driver(page_timeout=driver_pool.DRIVER_PAGE_TIMEOUT):
+        return ReplayDriver(store, page_latency)
+
+    def document_for(url):
+        page_html = store.page_html(url)
+        if page_html is None:
+            return FAILED_DOCUMENT
+        return PostViewDocument(page_html, f'"{abs(hash(url))}"', None, False)
+
+    def fetch_postview(url, etag=None, last_modified=None):
+        time.sleep(page_latency)
+        return document_for(url)
+
+    async def fetch_postviews(targets):
+        async def fetch(url):
+            await asyncio.sleep(page_latency)
+            return document_for(url)
+        return await asyncio.gather(*(fetch(target[0]) for target in targets))
+
+    def download_image(url):
+        time.sleep(page_latency)
+        data = store.image_bytes(url)
+        if data is None:
+            raise FileNotFoundError(f"녹화된 이미지 없음: {url}")
+        size = ocr_stage.read_image_size(data) if ocr_stage.PRESCREEN_ENABLED else None
+        if size is not None and not ocr_stage.passes_dimension_check(*size):
+            return None, ocr_stage.SKIP_DIMENSION
+        return data, None
+
+    def extract_text_from_images(image_urls):
+        # 녹화된 이미지만 OCR 대상 (실제 경로처럼 다운로드 실패한 이미지는 빠짐)
+        # 지연은 이미지당 ocr_latency, OCR_PROCESSES 개씩 병렬로 처리한다고 보고 계산
+        texts = [store.ocr_text(url) for url in image_urls if url in store.images]
+        time.sleep(ocr_latency * math.ceil(len(texts) / max(1, ocr_stage.OCR_PROCESSES)))
+        return "\n".join(text for text in texts if text)
+
+    driver_pool.create_driver = create_driver
+    extract_movie.fetch_postview = fetch_postview
+    extract_movie.fetch_postviews = fetch_postviews
+    ocr_stage.download_image = download_image
+    if ocr == "replay":
+        extract_movie.extract_text_from_images = extract_text_from_images
@@ -0,0 +1,95 @@
+"""
+페이지 추출 벤치마크
+- 저장된 네이버 블로그/뉴스 페이지(fixtures/pages/*.html)로 기존 방식(BeautifulSoup html.parser 로
+  본문용/이미지용 두 번 파싱)과 page_extract(lxml 한 번 파싱)의 처리 시간과 결과를 비교
+- 파일 이름이 naver_ 로 시작하면 네이버 블로그 선택자, 아니면 일반 페이지 선택자 사용
+- 실행: python benchmarks/page_extract_benchmark.py --repeat 200
+"""
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from text_cleaning import clean_text
+from page_extract import NO_BODY, filter_image_urls, extract_naver_page, extract_general_page
+
+DEFAULT_PAGES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "pages")
+GENERAL_SELECTORS = [
+    "div.article-body", "div.articleView", "div#article-view-content-div",
+    "div.entry-content", "div#content", "article", "body"
+]
+
+
+# ✅ 기존 방식 (extract_movie 의 extract_*_body + extract_image_urls 와 동일한 파싱 횟수)
+def legacy_images(page_html):
+    soup = BeautifulSoup(page_html, "html.parser")
+    return filter_image_urls(img.get("src") for img in soup.find_all("img"))
+
+
+def legacy_naver(page_html):
+    soup = BeautifulSoup(page_html, "html.parser")
+    content = soup.select_one("div.se-main-container") or soup.select_one("#postViewArea")
+    text = content.get_text(strip=True) if content else NO_BODY
+    return clean_text(text), legacy_images(page_html)
+
+
+def legacy_general(page_html):
+    soup = BeautifulSoup(page_html, "html.parser")
+    for sel in GENERAL_SELECTORS:
+        content = soup.select_one(sel)
+        if content and content.get_text(strip=True):
+            return clean_text(content.get_text(strip=True)), legacy_images(page_html)
+    return NO_BODY, []
+
+
+def current_naver(page_html):
+    page = extract_naver_page(page_html)
+    return (page.text if page.text is not None else NO_BODY), page.images
+
+
+def current_general(page_html):
+    page = extract_general_page(page_html)
+    return (page.text, page.images) if page.text is not None else (NO_BODY, [])
+
+
+def measure(func, page_html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func(page_html)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지 추출 벤치마크")
+    parser.add_argument("--pages", default=DEFAULT_PAGES)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.pages, "*.html")))
+    print(f"📂 페이지: {args.pages} ({len(paths)}개)")
+    print(f"\n{'page':<28}{'KB':>7}{'기존(ms)':>11}{'신규(ms)':>11}{'배수':>8}  결과")
+
+    mismatches = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            page_html = f.read()
+        is_naver = os.path.basename(path).startswith("naver_")
+        legacy, current = (legacy_naver, current_naver) if is_naver else (legacy_general, current_general)
+
+        same = legacy(page_html) == current(page_html)
+        mismatches += not same
+        old = measure(legacy, page_html, args.repeat)
+        new = measure(current, page_html, args.repeat)
+        print(f"{os.path.basename(path):<28}{len(page_html) / 1024:>7.1f}{old * 1000:>11.2f}{new * 1000:>11.2f}"
+              f"{old / new:>8.2f}  {'동일' if same else '다름'}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
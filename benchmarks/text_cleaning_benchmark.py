@@ -0,0 +1,100 @@
+"""
+본문 정제 벤치마크 + 기존 구현과의 결과 비교
+- 저장된 블로그 본문(fixtures/blog_bodies.jsonl)으로 기존 clean_text(정규식 13번) + preprocess_text 와
+  text_cleaning 모듈의 처리 시간과 출력이 같은지 비교
+- 실행: python benchmarks/text_cleaning_benchmark.py --repeat 2000
+- 출력이 다른 문서가 있으면 차이를 보여주고 종료 코드 1
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from text_cleaning import clean_text, preprocess_text
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "blog_bodies.jsonl")
+
+
+# ✅ 기존 구현 (extract_movie / extract_content 에 있던 것과 동일)
+def legacy_clean_text(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\u200b", "", text)
+    text = re.sub(r"\b\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}\b", "", text)
+    text = re.sub(
+        r"[\U0001F600-\U0001F64F"
+        r"\U0001F300-\U0001F5FF"
+        r"\U0001F680-\U0001F6FF"
+        r"\U0001F1E0-\U0001F1FF"
+        r"\u2600-\u26FF"
+        r"\u2700-\u27BF]+", "", text, flags=re.UNICODE)
+    patterns_to_remove = [
+        r"이\s?글은\s?.{0,20}제공받았습니다",
+        r"내\s?돈\s?내\s?산",
+        r"블로그에서\s?더\s?보기",
+        r"인스타그램\s?@[\w]+",
+        r"좋아요\s?[~!꾹♥❤❣️]*",
+        r"링크[:：]?\s?https?://[^\s]+",
+        r"클릭해서\s?확인하세요",
+        r"더\s?많은\s?사진은\s?블로그에서",
+        r"광고\s?포함",
+    ]
+    for pattern in patterns_to_remove:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def legacy_preprocess_text(main_text, ocr_text):
+    text = main_text + "\n" + ocr_text
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def load_corpus(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
+
+
+def measure(func, texts, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="본문 정제 벤치마크")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus)
+    print(f"📂 코퍼스: {args.corpus} ({len(texts)}개 본문, {sum(map(len, texts))}자)")
+
+    # 1. 출력 비교 (clean_text 단독, preprocess_text 까지 거친 최종 본문)
+    mismatches = 0
+    for i, text in enumerate(texts, 1):
+        old, new = legacy_clean_text(text), clean_text(text)
+        old_full, new_full = legacy_preprocess_text(old, text), preprocess_text(new, text)
+        if old != new or old_full != new_full:
+            mismatches += 1
+            print(f"\n❌ {i}번 본문 결과 다름\n  기존: {old!r}\n  신규: {new!r}")
+    print(f"\n동일 출력: {len(texts) - mismatches}/{len(texts)}")
+
+    # 2. 처리 시간
+    legacy = measure(lambda text: legacy_preprocess_text(legacy_clean_text(text), text), texts, args.repeat)
+    current = measure(lambda text: preprocess_text(clean_text(text), text), texts, args.repeat)
+    total = len(texts) * args.repeat
+    print(f"\n{'구현':<10}{'총 시간(s)':>12}{'본문/초':>14}")
+    print(f"{'기존':<10}{legacy:>12.3f}{total / legacy:>14.0f}")
+    print(f"{'신규':<10}{current:>12.3f}{total / current:>14.0f}")
+    print(f"속도 향상: {legacy / current:.2f}x")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+import os
+import zlib
+import numpy as np
+
+# ✅ 유사 중복 블로그 제거 설정
+BLOG_DEDUP_ENABLED = os.getenv("BLOG_DEDUP", "1") == "1"
+BLOG_DEDUP_THRESHOLD = float(os.getenv("BLOG_DEDUP_THRESHOLD", "0.8"))  # 추정 Jaccard 유사도 기준
+BLOG_DEDUP_SHINGLE = int(os.getenv("BLOG_DEDUP_SHINGLE", "5"))  # 글자 n-gram 길이
+BLOG_DEDUP_MIN_CHARS = int(os.getenv("BLOG_DEDUP_MIN_CHARS", "100"))  # 이보다 짧은 본문은 비교하지 않음
+# 1이면 중복 묶음 크기만큼 언급 블로그 수/언급률에 가중치 (map_reduce 모드만, 0이면 묶음당 한 번만 셈)
+BLOG_DEDUP_WEIGHT_MENTIONS = os.getenv("BLOG_DEDUP_WEIGHT_MENTIONS", "0") == "1"
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.RandomState(20240501)  # 실행마다 같은 해시 → 결과 재현 가능
+_A = _rng.randint(1, 1 << 31, NUM_PERM).astype(np.uint64)
+_B = _rng.randint(0, 1 << 31, NUM_PERM).astype(np.uint64)
+
+
+def minhash_signature(text, shingle=BLOG_DEDUP_SHINGLE):
+    """
+    공백을 뺀 본문의 글자 n-gram 집합 → MinHash 서명 (NUM_PERM 개)
+    - (a * crc32 + b) mod 2^61-1 의 최솟값, 곱셈이 uint64 범위를 넘지 않도록 crc32(32비트) 사용
+    """
+    compact = "".join(text.split())
+    shingles = {compact[i:i + shingle] for i in range(max(1, len(compact) - shingle + 1))}
+    hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+    return ((np.outer(hashes, _A) + _B) % _PRIME).min(axis=0)
+
+
+def estimated_similarity(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+class NearDuplicateIndex:
+    """
+    MinHash + LSH 밴딩으로 유사 중복 본문 찾기 (블로그 수에 대해 거의 선형)
+    - 대표(처음 들어온 본문)만 색인, 이후 본문은 같은 밴드 버킷의 대표들과만 비교
+    - add() 는 들어온 순서 번호 기준으로 대표 번호를 돌려줌 (중복이 아니면 자기 자신)
+    """
+
+    def __init__(self, threshold=BLOG_DEDUP_THRESHOLD, min_chars=BLOG_DEDUP_MIN_CHARS):
+        self.threshold = threshold
+        self.min_chars = min_chars
+        self.buckets = {}
+        self.signatures = {}
+        self.count = 0
+
+    def add(self, text):
+        index = self.count
+        self.count += 1
+        if len(text) < self.min_chars:
+            return index
+
+        signature = minhash_signature(text)
+        keys = [(band, signature[band * ROWS:(band + 1) * ROWS].tobytes()) for band in range(BANDS)]
+        candidates = sorted({c for key in keys for c in self.buckets.get(key, ())})
+        for candidate in candidates:
+            if estimated_similarity(signature, self.signatures[candidate]) >= self.threshold:
+                return candidate
+
+        self.signatures[index] = signature
+        for key in keys:
+            self.buckets.setdefault(key, []).append(index)
+        return index
+
+
+def dedup_blogs(all_blogs):
+    """
+    블로그 목록에서 유사 중복 제거 → (대표 블로그 목록, 대표별 묶음 크기)
+    - 대표는 묶음에서 먼저 나온(검색 순위가 높은) 블로그, 나머지 URL은 "중복 URL" 에 기록
+    - BLOG_DEDUP=0 이면 그대로 반환 (묶음 크기는 모두 1)
+    """
+    if not BLOG_DEDUP_ENABLED:
+        return list(all_blogs), [1] * len(all_blogs)
+
+    index = NearDuplicateIndex()
+    representatives = {}
+    unique = []
+    for i, blog_entry in enumerate(all_blogs):
+        rep = index.add(blog_entry["본문"])
+        if rep == i:
+            representatives[i] = len(unique)
+            unique.append({**blog_entry, "중복 URL": []})
+        else:
+            unique[representatives[rep]]["중복 URL"].append(blog_entry.get("url"))
+
+    cluster_sizes = [1 + len(blog_entry["중복 URL"]) for blog_entry in unique]
+    removed = len(all_blogs) - len(unique)
+    if removed:
+        print(f"[DEDUP] 블로그 {len(all_blogs)}개 중 유사 중복 {removed}개 제외 (묶음 크기: {[n for n in cluster_sizes if n > 1]})")
+    return unique, cluster_sizes
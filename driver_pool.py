@@ -0,0 +1,105 @@
+import os
+import queue
+import threading
+import atexit
+from contextlib import contextmanager
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+# ✅ 드라이버 풀 설정 (환경변수로 조정 가능)
+CHROME_DRIVER_PATH = os.getenv("CHROME_DRIVER_PATH", "C:/Users/keiro/moviecrawling/chromedriver-win64/chromedriver.exe")
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "4"))
+DRIVER_PAGE_TIMEOUT = float(os.getenv("DRIVER_PAGE_TIMEOUT", "20"))
+DRIVER_MAX_PAGES = int(os.getenv("DRIVER_MAX_PAGES", "50"))
+
+
+# ✅ 헤드리스 크롬 드라이버 생성
+def create_driver(page_timeout=DRIVER_PAGE_TIMEOUT):
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    service = Service(executable_path=CHROME_DRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.set_page_load_timeout(page_timeout)
+    return driver
+
+
+class DriverPool:
+    """
+    장기 실행 헤드리스 드라이버 풀
+    - 최대 size개의 드라이버를 필요할 때 생성해서 재사용
+    - max_pages 페이지를 처리했거나 WebDriver 오류(타임아웃 포함)가 나면 드라이버를 폐기하고 다음 사용 시 새로 생성
+    """
+
+    def __init__(self, size=DRIVER_POOL_SIZE, page_timeout=DRIVER_PAGE_TIMEOUT, max_pages=DRIVER_MAX_PAGES):
+        self.size = max(1, size)
+        self.page_timeout = page_timeout
+        self.max_pages = max_pages
+        self._slots = queue.Queue()
+        for _ in range(self.size):
+            self._slots.put({"driver": None, "pages": 0})
+        self._all_slots = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def driver(self):
+        slot = self._slots.get()
+        broken = False
+        try:
+            if slot["driver"] is None:
+                slot["driver"] = create_driver(self.page_timeout)
+                slot["pages"] = 0
+                with self._lock:
+                    if slot not in self._all_slots:
+                        self._all_slots.append(slot)
+            yield slot["driver"]
+        except WebDriverException:
+            broken = True
+            raise
+        finally:
+            slot["pages"] += 1
+            if broken or slot["pages"] >= self.max_pages or self._closed:
+                self._discard(slot, reason="오류" if broken else "재활용")
+            else:
+                try:
+                    slot["driver"].switch_to.default_content()
+                except Exception:
+                    self._discard(slot, reason="오류")
+            self._slots.put(slot)
+
+    def _discard(self, slot, reason):
+        driver = slot["driver"]
+        slot["driver"] = None
+        slot["pages"] = 0
+        if driver is None:
+            return
+        print(f"[♻️] 드라이버 교체 ({reason})")
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            slots = list(self._all_slots)
+        for slot in slots:
+            self._discard(slot, reason="종료")
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 드라이버 풀 (최초 사용 시 생성)
+def get_driver_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
@@ -1,23 +1,19 @@
-import re
 import pytesseract
 from PIL import Image
 import requests
 from io import BytesIO
-from transformers import AutoTokenizer, AutoModelForTokenClassification
-from transformers import pipeline
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from extract_content import extract_body_text, extract_image_urls
 from urlcrawling import get_blog_urls_with_selenium
+from text_signals import ADDRESS_PATTERN
+from text_cleaning import preprocess_text
+from model_registry import get_ner
 
 # ✅ Tesseract 경로 지정
 pytesseract.pytesseract.tesseract_cmd = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
 
-# ✅ NER 모델 로딩
-model_name = "Leo97/KoELECTRA-small-v3-modu-ner"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForTokenClassification.from_pretrained(model_name)
-ner = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
+# ✅ NER 모델은 처음 사용할 때 로딩 (model_registry → ner_inference, 긴 본문은 윈도우로 나눠 배치 추론)
 
 # ✅ OCR 텍스트 추출
 def extract_text_from_images(image_urls):
@@ -33,18 +29,11 @@ def extract_text_from_images(image_urls):
             continue
     return "\n".join(texts)
 
-# ✅ 본문 + OCR 텍스트 전처리 (주소 정제 + 통합)
-def preprocess_text(main_text, ocr_text):
-    text = main_text + "\n" + ocr_text
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
-
 # ✅ 장소/주소/장면 설명 추출
 def extract_location_info(text):
-    entities = ner(text)
+    entities = get_ner()(text)
     location_names = [e['word'] for e in entities if e['entity_group'] == 'LOC']
-    address_pattern = r'(서울|부산|대전|광주|대구|인천|수원|제주|경기|강원|충북|충남|전북|전남|경북|경남)[^, \n]{2,}'
-    addresses = re.findall(address_pattern, text)
+    addresses = ADDRESS_PATTERN.findall(text)
     return list(set(location_names)), list(set(addresses))
 
 # ✅ 전체 실행 파이프라인
@@ -1,262 +1,290 @@
-import re
-import time
-import pytesseract
-import requests
-from PIL import Image
-from io import BytesIO
-from bs4 import BeautifulSoup
-from selenium import webdriver
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
-import urllib.parse
-
-
-# ✅ Tesseract 경로 설정
-pytesseract.pytesseract.tesseract_cmd = r"C:/Program Files/Tesseract-OCR/tesseract.exe"
-
-# ✅ NER 모델 로딩
-model_name = "Leo97/KoELECTRA-small-v3-modu-ner"
-tokenizer = AutoTokenizer.from_pretrained(model_name)
-model = AutoModelForTokenClassification.from_pretrained(model_name)
-ner = pipeline("ner", model=model, tokenizer=tokenizer, aggregation_strategy="simple")
+from urllib.parse import urlparse, urlunparse, quote
 
-# ✅ URL 정규화 함수 (파라미터 제거)
-def normalize_url(url):
-    parsed = urlparse(url)
-    return urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
+from driver_pool import DriverPool, get_driver_pool
+from naver_http import fetch_postview, fetch_postviews
+from page_extract import NAVER_BODY_SELECTORS, NO_BODY, extract_naver_page, extract_general_page
+from ocr_stage import extract_text_from_images
+from page_cache import FRESH, STALE, get_page_cache
+from search_cache import get_search_cache, search_key
+from text_cleaning import preprocess_text
+from page_wait import (
+    SCROLL_SETTLE_TIMEOUT, SCROLL_MAX_ITERATIONS, timed_step, wait_for_document_ready, wait_for_frame,
+    wait_for_any_selector, wait_for_stable_count, wait_for_height_change,
+)
 
-# ✅ 스크롤 내리는 함수
-def scroll_to_bottom(driver, pause_time=1.0):
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
-        # 스크롤 아래로
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause_time)
 
-        # 스크롤 후 높이 확인
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break  # 더 이상 안 내려감
-        last_height = new_height
-        
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urlunparse, quote
-import time
+# ✅ 네이버 블로그 HTTP 직접 요청 사용 여부 (실패 시 Selenium으로 대체)
+USE_NAVER_HTTP = os.getenv("USE_NAVER_HTTP", "1") == "1"
 
 # ✅ URL 정규화 함수 (파라미터 제거)
 def normalize_url(url):
     parsed = urlparse(url)
     return urlunparse((parsed.scheme, parsed.netloc, parsed.path, "", "", ""))
 
-# ✅ 스크롤 내리기 (JS 기반 무한 스크롤 지원)
-def scroll_to_bottom(driver, pause_time=1.5):
+# ✅ 스크롤 내리기 (JS 기반 무한 스크롤 지원, 높이가 더 이상 늘지 않거나 max_iterations 번 내리면 종료)
+def scroll_to_bottom(driver, settle_timeout=SCROLL_SETTLE_TIMEOUT, max_iterations=SCROLL_MAX_ITERATIONS):
     last_height = driver.execute_script("return document.body.scrollHeight")
-    while True:
+    for _ in range(max_iterations):
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(pause_time)
-        new_height = driver.execute_script("return document.body.scrollHeight")
+        new_height = wait_for_height_change(driver, last_height, timeout=settle_timeout)
         if new_height == last_height:
-            break
+            return
         last_height = new_height
-
-# ✅ 블로그 URL 크롤링 (다중 키워드 + 중복 제거 포함)
-def get_blog_urls_with_selenium(movie_title, max_results=30):
-    keyword_suffixes = ["촬영지", "촬영 장소", "배경지", "성지순례", "영화 장소"]
-    all_links = []
-    normalized_links = set()
-
-    # ✅ 크롬 드라이버 설정
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    chrome_driver_path = "C:/Users/keiro/moviecrawling/chromedriver-win64/chromedriver.exe"
-    service = Service(executable_path=chrome_driver_path)
-    driver = webdriver.Chrome(service=service, options=options)
-
-    try:
-        for suffix in keyword_suffixes:
-            query = f"{movie_title} {suffix}"
-            encoded_query = quote(query)
-            print(f"\n[🔍] 검색어: {query}")
-
-            start = 1
-            while len(all_links) < max_results:
-                url = f"https://search.naver.com/search.naver?where=view&query={encoded_query}&start={start}"
-                print(f"[INFO] 검색 페이지: {url}")
+    print(f"[WARN] 스크롤 {max_iterations}회 도달 → 중단")
+
+# ✅ 검색어 하나의 블로그 링크 수집 (검색 결과 순서 유지, 최대 limit 개)
+def search_blog_links(pool, query, limit):
+    links = []
+    seen = set()
+    encoded_query = quote(query)
+    print(f"\n[🔍] 검색어: {query}")
+
+    with pool.driver() as driver:
+        start = 1
+        while len(links) < limit:
+            url = f"https://search.naver.com/search.naver?where=view&query={encoded_query}&start={start}"
+            print(f"[INFO] 검색 페이지: {url}")
+            with timed_step("검색 페이지 로딩"):
                 driver.get(url)
-                time.sleep(2)
+                wait_for_stable_count(driver, "a.link_tit")
+            with timed_step("검색 페이지 스크롤"):
                 scroll_to_bottom(driver)
 
-                elements = driver.find_elements(By.CSS_SELECTOR, "a.link_tit")
-                if not elements:
-                    print("[WARN] 결과 없음, 다음 키워드로")
-                    break
-
-                before = len(all_links)
-                for e in elements:
-                    href = e.get_attribute("href")
-                    normalized = normalize_url(href)
-
-                    if href and normalized not in normalized_links:
-                        normalized_links.add(normalized)
-                        all_links.append(href)
-                    if len(all_links) >= max_results:
-                        break
+            elements = driver.find_elements(By.CSS_SELECTOR, "a.link_tit")
+            if not elements:
+                print(f"[WARN] 결과 없음: {query}")
+                break
 
-                after = len(all_links)
-                if after == before:
-                    print("[STOP] 새로운 링크 없음 → 다음 키워드로")
+            before = len(links)
+            for e in elements:
+                href = e.get_attribute("href")
+                if not href or normalize_url(href) in seen:
+                    continue
+                seen.add(normalize_url(href))
+                links.append(href)
+                if len(links) >= limit:
                     break
 
-                start += 10
-
-            if len(all_links) >= max_results:
-                print("[✅] 최대 개수 도달")
+            if len(links) == before:
+                print(f"[STOP] 새로운 링크 없음: {query}")
                 break
 
-    finally:
-        driver.quit()
-
-    return all_links[:max_results]
-
-# ✅ 정제 함수 (본문용)
-def clean_text(text):
-    text = re.sub(r"\s+", " ", text)
-    text = re.sub(r"\u200b", "", text)
-    text = re.sub(r"\b\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}\b", "", text)
-    text = re.sub(
-        r"[\U0001F600-\U0001F64F"  # emoticons
-        r"\U0001F300-\U0001F5FF"
-        r"\U0001F680-\U0001F6FF"
-        r"\U0001F1E0-\U0001F1FF"
-        r"\u2600-\u26FF"
-        r"\u2700-\u27BF]+", "", text, flags=re.UNICODE)
-    patterns_to_remove = [
-        r"이\s?글은\s?.{0,20}제공받았습니다",
-        r"내\s?돈\s?내\s?산",
-        r"블로그에서\s?더\s?보기",
-        r"인스타그램\s?@[\w]+",
-        r"좋아요\s?[~!꾹♥❤❣️]*",
-        r"링크[:：]?\s?https?://[^\s]+",
-        r"클릭해서\s?확인하세요",
-        r"더\s?많은\s?사진은\s?블로그에서",
-        r"광고\s?포함",
-    ]
-    for pattern in patterns_to_remove:
-        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
-    return text.strip()
-
-# ✅ 이미지 URL 추출 함수
-
-def extract_image_urls(driver):
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    img_tags = soup.find_all("img")
-    valid_images = []
-    for img in img_tags:
-        src = img.get("src")
-        if not src:
-            continue
-        if any(domain in src for domain in ["adimg", "doubleclick", "googlesyndication", "adsystem"]):
-            continue
-        if "base64" in src or src.endswith(".gif"):
-            continue
-        valid_images.append(src)
-    return valid_images
+            start += 10
+
+    return links
+
+# ✅ 검색어별 결과 병합 (normalize_url 기준 중복 제거, 항상 같은 순서)
+# - 여러 검색어에 나온 링크 우선 → 검색 결과 내 순위가 높은 링크 → 먼저 나온 검색어 순
+def merge_search_results(links_per_query):
+    stats = {}
+    for query_index, links in enumerate(links_per_query):
+        for rank, href in enumerate(links):
+            normalized = normalize_url(href)
+            if normalized not in stats:
+                stats[normalized] = {"href": href, "hits": 0, "rank": rank, "query": query_index}
+            entry = stats[normalized]
+            entry["hits"] += 1
+            entry["rank"] = min(entry["rank"], rank)
+    ranked = sorted(stats.values(), key=lambda e: (-e["hits"], e["rank"], e["query"]))
+    return [entry["href"] for entry in ranked]
 
-# ✅ 본문 추출 함수들
+# ✅ 블로그 URL 크롤링 (다중 키워드 + 중복 제거 포함)
+# - 검색어들을 드라이버 풀에서 병렬로 검색, 결과 URL 목록은 (제목, 검색어 집합) 단위로 TTL 캐시
+def get_blog_urls_with_selenium(movie_title, max_results=30):
+    keyword_suffixes = ["촬영지", "촬영 장소", "배경지", "성지순례", "영화 장소"]
+    cache = get_search_cache()
+    key = search_key(movie_title, keyword_suffixes)
+    if cache is not None:
+        cached = cache.get(key, max_results)
+        if cached is not None:
+            print(f"[검색 캐시] 적중: {movie_title} ({len(cached)}개)")
+            return cached
+
+    pool = get_driver_pool()
+    queries = [f"{movie_title} {suffix}" for suffix in keyword_suffixes]
+    with timed_step("검색 (병렬)"):
+        with ThreadPoolExecutor(max_workers=min(pool.size, len(queries))) as executor:
+            futures = [executor.submit(search_blog_links, pool, query, max_results) for query in queries]
+            links_per_query = []
+            for query, future in zip(queries, futures):
+                try:
+                    links_per_query.append(future.result())
+                except Exception as e:
+                    print(f"[ERROR] 검색 실패: {query} ({e})")
+                    links_per_query.append([])
+
+    all_links = merge_search_results(links_per_query)[:max_results]
+    print(f"[✅] 검색어 {len(queries)}개 → 블로그 {len(all_links)}개")
+    if cache is not None and any(links_per_query):
+        cache.put(key, all_links, max_results)
+    return all_links
+
+# ✅ 본문 추출 함수들 (페이지 HTML 한 번만 가져와서 본문/이미지를 같은 파싱 결과에서 추출)
 
 def extract_naver_blog_body(driver, url):
-    driver.get(url)
-    time.sleep(2)
-    try:
-        driver.switch_to.frame("mainFrame")
-        time.sleep(1)
-    except:
-        return "[ERROR] iframe 접근 실패", []
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    content = soup.select_one("div.se-main-container") or soup.select_one("#postViewArea")
-    text = content.get_text(strip=True) if content else "[본문 없음]"
-    return clean_text(text), extract_image_urls(driver)
+    with timed_step("네이버 블로그 로딩"):
+        driver.get(url)
+        if not wait_for_frame(driver, "mainFrame"):
+            return "[ERROR] iframe 접근 실패", []
+        wait_for_any_selector(driver, [css for css, _ in NAVER_BODY_SELECTORS])
+    page = extract_naver_page(driver.page_source)
+    return (page.text if page.text is not None else NO_BODY), page.images
 
 def extract_general_body(driver, url):
-    driver.get(url)
-    time.sleep(2)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    selectors = [
-        "div.article-body", "div.articleView", "div#article-view-content-div",
-        "div.entry-content", "div#content", "article", "body"
-    ]
-    for sel in selectors:
-        content = soup.select_one(sel)
-        if content and content.get_text(strip=True):
-            return clean_text(content.get_text(strip=True)), extract_image_urls(driver)
-    return "[본문 없음]", []
-
-def extract_body_text(driver, url):
+    with timed_step("일반 페이지 로딩"):
+        driver.get(url)
+        wait_for_document_ready(driver)
+    page = extract_general_page(driver.page_source)
+    if page.text is None:
+        return NO_BODY, []
+    return page.text, page.images
+
+# ✅ 네이버 블로그 HTTP 경로 (PostView 문서 직접 파싱, 실패 시 None)
+def extract_naver_blog_body_http(url, document=None):
+    if document is None:
+        document = fetch_postview(url)
+    if document.html is None:
+        return None
+    page = extract_naver_page(document.html)
+    if not page.raw_length:
+        return None
+    return page.text, page.images
+
+def _run_with_driver(driver, extract_func, url):
+    if isinstance(driver, DriverPool):
+        with driver.driver() as pooled_driver:
+            return extract_func(pooled_driver, url)
+    return extract_func(driver, url)
+
+# ✅ 본문 추출 진입점
+# - driver 자리에 DriverPool을 넘기면 Selenium이 필요할 때만 드라이버를 빌려 씀
+# - document: 미리 받아둔 PostViewDocument (네이버 블로그 HTTP 경로용)
+def extract_body_text(driver, url, document=None):
     if "blog.naver.com" in url:
-        return extract_naver_blog_body(driver, url)
+        if USE_NAVER_HTTP:
+            result = extract_naver_blog_body_http(url, document)
+            if result is not None:
+                return result
+            print(f"[HTTP] Selenium으로 대체: {url}")
+        return _run_with_driver(driver, extract_naver_blog_body, url)
     else:
-        return extract_general_body(driver, url)
-
-# ✅ OCR 텍스트 추출
-def extract_text_from_images(image_urls):
-    texts = []
-    for url in image_urls:
-        try:
-            response = requests.get(url, timeout=5)
-            img = Image.open(BytesIO(response.content))
-            if img.width < 100 or img.height < 100:
-                continue
-            text = pytesseract.image_to_string(img, lang="kor")
-            if text.strip():
-                texts.append(text.strip())
-        except:
-            continue
-    return "\n".join(texts)
-
-# ✅ 텍스트 통합 및 전처리
-def preprocess_text(main_text, ocr_text):
-    text = main_text + "\n" + ocr_text
-    return re.sub(r"\s+", " ", text).strip()
-
-
-
-# ✅ 메인 실행 파이프라인
-def extract_all_info_from_movie(movie_title, max_results=30):
-    results = []
-    urls = get_blog_urls_with_selenium(movie_title, max_results=max_results)
-
-    options = Options()
-    options.add_argument("--headless=new")
-    options.add_argument("--disable-gpu")
-    options.add_argument("--no-sandbox")
-    service = Service("C:/Users/keiro/moviecrawling/chromedriver-win64/chromedriver.exe")
-    driver = webdriver.Chrome(service=service, options=options)
-
+        return _run_with_driver(driver, extract_general_body, url)
+
+def _uses_http_path(url):
+    return USE_NAVER_HTTP and "blog.naver.com" in url
+
+def _is_valid_body(body):
+    return not body.startswith("[ERROR]") and body != NO_BODY
+
+# ✅ 페이지 새로 가져와서 캐시에 저장 → (본문, 이미지)
+# - 캐시된 ETag/Last-Modified가 있으면 조건부 요청, 304면 캐시 그대로 사용
+def refresh_page(pool, url, cached=None, document=None):
+    cache = get_page_cache()
+    key = normalize_url(url)
+    if document is None and _uses_http_path(url):
+        document = fetch_postview(url, cached.etag if cached else None, cached.last_modified if cached else None)
+    if document is not None and document.not_modified and cached is not None:
+        cache.touch(key)
+        return cached.body, cached.images
+
+    body, images = extract_body_text(pool, url, document)
+    if cache is not None and _is_valid_body(body):
+        etag = document.etag if document is not None else None
+        last_modified = document.last_modified if document is not None else None
+        cache.put(key, body, images, etag, last_modified)
+    return body, images
+
+# ✅ 페이지 본문/이미지 (캐시 우선) → (본문, 이미지)
+def load_page(pool, url, document=None):
+    cache = get_page_cache()
+    if cache is None:
+        return extract_body_text(pool, url, document)
+
+    cached = cache.get(normalize_url(url))
+    state = cache.freshness(cached)
+    if state == FRESH:
+        print(f"[캐시] 사용: {url}")
+        return cached.body, cached.images
+    if state == STALE:
+        print(f"[캐시] 오래된 항목 사용 + 백그라운드 재검증: {url}")
+        cache.revalidate_in_background(normalize_url(url), lambda: refresh_page(pool, url, cached))
+        return cached.body, cached.images
+    return refresh_page(pool, url, cached, document)
+
+# ✅ URL 하나 처리 (드라이버는 Selenium 경로의 본문/이미지 추출 동안만 점유)
+def extract_info_from_url(pool, url, document=None, progress=None):
+    print(f"[🔗] {url}")
+    body, images = load_page(pool, url, document)
+    if progress:
+        progress("fetch")
+    ocr_text = extract_text_from_images(images)
+    if progress:
+        progress("ocr")
+    full_text = preprocess_text(body, ocr_text)
+    return {
+        "url": url,
+        "본문": full_text
+    }
+
+# ✅ 단계별 완료 개수 집계 (워커 스레드에서 호출) → progress(stage, done, total)
+def _stage_counter(progress, total):
+    counts = {}
+    lock = threading.Lock()
+
+    def done(stage):
+        with lock:
+            counts[stage] = counts.get(stage, 0) + 1
+            progress(stage, counts[stage], total)
+
+    return done
+
+# ✅ 캐시에서 바로 쓸 수 없는 네이버 블로그는 PostView 문서를 비동기로 한 번에 받아둠
+def prefetch_postviews(urls):
+    cache = get_page_cache()
+    targets = []
     for url in urls:
-        try:
-            print(f"[🔗] {url}")
-            body, images = extract_body_text(driver, url)
-            ocr_text = extract_text_from_images(images)
-            full_text = preprocess_text(body, ocr_text)
-
-            results.append({
-                "url": url,
-                "본문": full_text
-            })
-        except Exception as e:
-            print(f"[ERROR] {url}: {e}")
+        if not _uses_http_path(url):
             continue
-
-    driver.quit()
-    return results
+        cached = cache.get(normalize_url(url)) if cache is not None else None
+        if cache is not None and cache.freshness(cached) in (FRESH, STALE):
+            continue
+        targets.append((url, cached.etag if cached else None, cached.last_modified if cached else None))
+    if not targets:
+        return {}
+    documents = asyncio.run(fetch_postviews(targets))
+    return {target[0]: document for target, document in zip(targets, documents)}
+
+# ✅ 추출이 끝나는 대로 (입력 순서 번호, 결과) 를 내보내는 파이프라인 (드라이버 풀 크기만큼 병렬 처리)
+# - progress(stage, done, total): 진행 상황 콜백 (search / fetch / ocr)
+def iter_info_from_movie(movie_title, max_results=30, progress=None):
+    urls = get_blog_urls_with_selenium(movie_title, max_results=max_results)
+    if progress:
+        progress("search", 1, 1)
+    prefetched = prefetch_postviews(urls)
+
+    counter = _stage_counter(progress, len(urls)) if progress else None
+    pool = get_driver_pool()
+    with ThreadPoolExecutor(max_workers=pool.size) as executor:
+        futures = {
+            executor.submit(extract_info_from_url, pool, url, prefetched.get(url), counter): index
+            for index, url in enumerate(urls)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                yield index, future.result()
+            except Exception as e:
+                print(f"[ERROR] {urls[index]}: {e}")
+
+# ✅ 메인 실행 파이프라인 (입력 URL 순서 유지)
+def extract_all_info_from_movie(movie_title, max_results=30, progress=None):
+    results = sorted(iter_info_from_movie(movie_title, max_results, progress), key=lambda item: item[0])
+    return [info for _, info in results]
 
 # ✅ 단독 실행
 if __name__ == "__main__":
@@ -0,0 +1,234 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+
+from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+from openai.types.chat import ChatCompletion
+
+from model_registry import get_openai_client
+from token_budget import count_tokens
+from llm_cache import get_llm_cache, is_cacheable, request_key
+
+# ✅ GPT 호출 제한/재시도 설정 (0이면 제한 없음)
+GPT_MAX_CONCURRENCY = int(os.getenv("GPT_MAX_CONCURRENCY", "8"))
+GPT_REQUESTS_PER_MINUTE = int(os.getenv("GPT_REQUESTS_PER_MINUTE", "500"))
+GPT_TOKENS_PER_MINUTE = int(os.getenv("GPT_TOKENS_PER_MINUTE", "0"))  # 계정 TPM 한도에 맞춰 지정
+GPT_EXPECTED_OUTPUT_TOKENS = int(os.getenv("GPT_EXPECTED_OUTPUT_TOKENS", "1000"))  # 호출 전 출력 토큰 추정치
+GPT_MAX_RETRIES = int(os.getenv("GPT_MAX_RETRIES", "5"))
+GPT_BACKOFF_BASE = float(os.getenv("GPT_BACKOFF_BASE", "1.0"))
+GPT_BACKOFF_MAX = float(os.getenv("GPT_BACKOFF_MAX", "30"))
+
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
+
+class TokenBucket:
+    """
+    분당 허용량(rate_per_minute)만큼 채워지는 버킷
+    - rate_per_minute 이 0 이하이면 항상 통과
+    """
+
+    def __init__(self, rate_per_minute):
+        self.capacity = rate_per_minute
+        self.level = rate_per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    # amount 만큼 쓰려면 기다려야 하는 시간 (버킷보다 큰 요청은 버킷 크기로 취급)
+    def wait_time(self, amount):
+        if self.capacity <= 0:
+            return 0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0 if self.level >= amount else (amount - self.level) * 60 / self.capacity
+
+    # 실제 사용량 반영 (추정치와의 차이를 보정할 때는 음수도 가능)
+    def consume(self, amount):
+        if self.capacity > 0:
+            self._refill()
+            self.level -= amount
+
+
+class RateLimiter:
+    """
+    요청 수/토큰 수 버킷을 함께 확인하는 스케줄러 (이벤트 루프 안에서만 사용)
+    - 429 응답의 retry-after 는 pause() 로 반영해서 그 시간 동안 모든 호출을 멈춤
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens):
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.paused_until - time.monotonic(),
+                    self.requests.wait_time(1),
+                    self.tokens.wait_time(tokens),
+                )
+                if wait <= 0:
+                    self.requests.consume(1)
+                    self.tokens.consume(tokens)
+                    return
+                await asyncio.sleep(wait)
+
+    def adjust(self, delta_tokens):
+        self.tokens.consume(delta_tokens)
+
+    def pause(self, seconds):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+# ✅ 호출 지표 (누적 + 최근 지연시간)
+_metrics_lock = threading.Lock()
+_metrics = {
+    "calls": 0, "failures": 0, "retries": 0, "rate_limited": 0,
+    "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0,
+}
+_latencies = deque(maxlen=1000)
+
+_loop = None
+_semaphore = None
+_limiter = None
+_loop_lock = threading.Lock()
+
+
+# ✅ GPT 호출 전용 이벤트 루프 (백그라운드 스레드 하나, 세마포어/버킷을 모든 요청이 공유)
+def _get_loop():
+    global _loop, _semaphore, _limiter
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _semaphore = asyncio.Semaphore(GPT_MAX_CONCURRENCY) if GPT_MAX_CONCURRENCY > 0 else None
+            _limiter = RateLimiter(GPT_REQUESTS_PER_MINUTE, GPT_TOKENS_PER_MINUTE)
+            threading.Thread(target=_loop.run_forever, name="gpt-client", daemon=True).start()
+    return _loop
+
+
+def estimate_tokens(messages):
+    return sum(count_tokens(str(message.get("content", ""))) for message in messages) + GPT_EXPECTED_OUTPUT_TOKENS
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _backoff(attempt):
+    # 지수 백오프 + full jitter
+    return random.uniform(0, min(GPT_BACKOFF_MAX, GPT_BACKOFF_BASE * 2 ** attempt))
+
+
+def _record(latency, usage, retries, failed):
+    with _metrics_lock:
+        _metrics["calls"] += 1
+        _metrics["failures"] += int(failed)
+        _metrics["retries"] += retries
+        _metrics["seconds"] += latency
+        if usage is not None:
+            _metrics["prompt_tokens"] += usage.prompt_tokens
+            _metrics["completion_tokens"] += usage.completion_tokens
+        _latencies.append(latency)
+
+
+async def _call(kwargs):
+    estimated = estimate_tokens(kwargs.get("messages", []))
+    start = time.perf_counter()
+    attempt = 0
+    while True:
+        # 토큰 추정치는 요청 하나당 한 번만 차감 (재시도는 요청 수 버킷만 사용)
+        await _limiter.acquire(estimated if attempt == 0 else 0)
+        try:
+            if _semaphore is None:
+                response = await get_openai_client().chat.completions.create(**kwargs)
+            else:
+                async with _semaphore:
+                    response = await get_openai_client().chat.completions.create(**kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt >= GPT_MAX_RETRIES:
+                _record(time.perf_counter() - start, None, attempt, failed=True)
+                raise
+            delay = _backoff(attempt)
+            if isinstance(e, RateLimitError):
+                with _metrics_lock:
+                    _metrics["rate_limited"] += 1
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                _limiter.pause(delay)
+            attempt += 1
+            print(f"[GPT] {type(e).__name__} → {delay:.1f}s 후 재시도 ({attempt}/{GPT_MAX_RETRIES})")
+            await asyncio.sleep(delay)
+            continue
+        except Exception:
+            _record(time.perf_counter() - start, None, attempt, failed=True)
+            raise
+
+        latency = time.perf_counter() - start
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            _limiter.adjust(usage.total_tokens - estimated)
+        _record(latency, usage, attempt, failed=False)
+        tokens = f"{usage.prompt_tokens}/{usage.completion_tokens}" if usage is not None else "-"
+        print(f"[GPT] {latency:.2f}s 토큰(입력/출력) {tokens} 재시도 {attempt}")
+        return response
+
+
+# ✅ 응답 캐시 확인 → 없으면 호출 후 저장 (temperature 가 높거나 n>1, stream 이면 캐시 안 씀)
+async def _create(kwargs):
+    cache = get_llm_cache()
+    if cache is None:
+        return await _call(kwargs)
+    if not is_cacheable(kwargs):
+        cache.record_bypass()
+        return await _call(kwargs)
+
+    key = request_key(kwargs)
+    cached = cache.get(key)
+    if cached is not None:
+        print("[GPT 캐시] 적중")
+        return ChatCompletion.model_validate_json(cached)
+    response = await _call(kwargs)
+    cache.put(key, kwargs.get("model", ""), response.model_dump_json())
+    return response
+
+
+# ✅ 비동기 호출 (다른 이벤트 루프에서 호출해도 GPT 전용 루프에서 실행)
+async def achat_completion(**kwargs):
+    future = asyncio.run_coroutine_threadsafe(_create(kwargs), _get_loop())
+    return await asyncio.wrap_future(future)
+
+
+def chat_completion(**kwargs):
+    """
+    chat.completions.create 와 같은 인자로 호출하는 동기 버전 (모든 GPT 호출의 공통 경로)
+    - 전역 동시 호출 수 제한(GPT_MAX_CONCURRENCY), 분당 요청/토큰 버킷, 429/타임아웃/5xx 재시도(지수 백오프 + jitter)
+    - 같은 (model, temperature, messages, response_format) 요청은 llm_cache 응답 재사용
+    - OPENAI_BASE_URL 을 지정하면 로컬 목(mock) 서버로 보낼 수 있음
+    """
+    return asyncio.run_coroutine_threadsafe(_create(kwargs), _get_loop()).result()
+
+
+# ✅ 누적 호출 지표 (지연시간 p50/p95 는 최근 1000건 기준)
+def get_gpt_metrics():
+    with _metrics_lock:
+        metrics = dict(_metrics)
+        latencies = sorted(_latencies)
+    if latencies:
+        metrics["latency_p50"] = round(latencies[len(latencies) // 2], 3)
+        metrics["latency_p95"] = round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3)
+    metrics["seconds"] = round(metrics["seconds"], 3)
+    return metrics
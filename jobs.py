@@ -0,0 +1,282 @@
+import os
+import json
+import time
+import uuid
+import queue
+import sqlite3
+import threading
+
+# ✅ 작업 큐 설정
+JOB_STORE_PATH = os.getenv("JOB_STORE_PATH", "cache/jobs.sqlite3")
+JOB_MAX_CONCURRENCY = int(os.getenv("JOB_MAX_CONCURRENCY", "2"))
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "10"))
+# 실행 중인 작업은 JOB_HEARTBEAT_SECONDS 마다 updated_at 을 갱신하고, 같은 주기로 오래된 running 작업을 검사
+# JOB_STALE_MINUTES 동안 갱신이 없는 running 작업은 실행하던 서버가 중단된 것으로 보고 실패 처리
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALE_SECONDS = float(os.getenv("JOB_STALE_MINUTES", "3")) * 60
+
+# 작업 상태
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# 진행 단계 (검색 → 본문 수집 → OCR → GPT → 필터)
+STAGES = ["search", "fetch", "ocr", "gpt", "filter"]
+
+
+class QueueFullError(Exception):
+    pass
+
+
+class JobStore:
+    """
+    작업 상태 저장소 (SQLite, 재시작 후에도 유지)
+    """
+
+    def __init__(self, path=JOB_STORE_PATH):
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                request TEXT NOT NULL,
+                status TEXT NOT NULL,
+                stage TEXT,
+                progress TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def create(self, request):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        progress = {stage: {"done": 0, "total": 0} for stage in STAGES}
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, json.dumps(request, ensure_ascii=False), QUEUED, None, json.dumps(progress), None, None, now, now),
+            )
+            self._conn.commit()
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, request, status, stage, progress, result, error, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "id": row[0],
+            "request": json.loads(row[1]),
+            "status": row[2],
+            "stage": row[3],
+            "progress": json.loads(row[4]),
+            "result": json.loads(row[5]) if row[5] is not None else None,
+            "error": row[6],
+            "created_at": row[7],
+            "updated_at": row[8],
+        }
+
+    def update(self, job_id, **fields):
+        if "progress" in fields:
+            fields["progress"] = json.dumps(fields["progress"])
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False)
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+            self._conn.commit()
+
+    def queued(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    # ✅ 상태를 expected → status 로 원자적으로 변경 (다른 프로세스가 먼저 바꿨으면 False)
+    def claim(self, job_id, expected, status):
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (status, time.time(), job_id, expected),
+            )
+            self._conn.commit()
+        return cursor.rowcount == 1
+
+    # ✅ 실행 중인 작업의 updated_at 갱신 (heartbeat)
+    def touch(self, job_ids):
+        if not job_ids:
+            return
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET updated_at = ? WHERE status = ? AND id IN ({placeholders})",
+                (time.time(), RUNNING, *job_ids),
+            )
+            self._conn.commit()
+
+    # ✅ 지정한 running 작업을 실패 처리 (서버 종료로 중단되는 작업)
+    def fail_running(self, job_ids, error):
+        if not job_ids:
+            return
+        placeholders = ", ".join("?" for _ in job_ids)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status = ? AND id IN ({placeholders})",
+                (FAILED, error, time.time(), RUNNING, *job_ids),
+            )
+            self._conn.commit()
+
+    # ✅ 오래 갱신되지 않은 running 작업을 실패 처리 → 처리한 작업 id 목록
+    def fail_stale(self, stale_seconds, error):
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE status = ? AND updated_at < ? RETURNING id",
+                (FAILED, error, now, RUNNING, now - stale_seconds),
+            ).fetchall()
+            self._conn.commit()
+        return [row[0] for row in rows]
+
+
+class JobQueue:
+    """
+    장소 추출 작업 큐
+    - 최대 max_concurrency개를 백그라운드에서 동시에 실행, 대기 포함 max_pending개를 넘으면 거절
+    - runner(request, progress) 는 결과(JSON 직렬화 가능)를 반환하고, progress(stage, done, total) 로 진행 상황 보고
+    - 작업은 실행 직전에 queued → running 으로 원자적으로 가져감 (여러 프로세스가 같은 저장소를 써도 한 번만 실행)
+    - start(): 서버 시작 시 호출, 중단된 작업 복구 후 작업 스레드와 heartbeat/정리 스레드 시작
+      · 실행 중인 작업은 heartbeat 로 계속 갱신 → 서버가 죽으면 갱신이 멈추고, 살아 있는 서버(재시작한 서버 포함)가
+        stale_seconds 뒤에 실패 처리 (재시작이 stale_seconds 안에 끝나도 running 으로 남지 않음)
+    - shutdown(): 아직 시작하지 않은 작업은 queued 로 남겨 다음 시작 때 재개, 실행 중인 작업은 실패 처리
+      · 작업 스레드는 daemon 이라 실행 중인 작업이 인터프리터 종료를 막지 않음 (종료 시 그대로 중단됨)
+    """
+
+    def __init__(self, runner, store=None, max_concurrency=JOB_MAX_CONCURRENCY, max_pending=JOB_MAX_PENDING,
+                 heartbeat_seconds=JOB_HEARTBEAT_SECONDS, stale_seconds=JOB_STALE_SECONDS):
+        self.runner = runner
+        self.store = store or JobStore()
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._active = 0
+        self._running = set()
+        self._stopped = threading.Event()
+
+    def start(self):
+        self.recover()
+        for i in range(self.max_concurrency):
+            threading.Thread(target=self._worker, name=f"job-{i}", daemon=True).start()
+        threading.Thread(target=self._monitor, name="job-heartbeat", daemon=True).start()
+
+    def recover(self):
+        # running 작업은 다시 실행하지 않음 (그 작업 때문에 프로세스가 죽었다면 무한 재시도가 됨)
+        self._fail_stale()
+        for job_id in self.store.queued():
+            print(f"[JOB] 재시작 후 작업 재개: {job_id}")
+            with self._lock:
+                self._active += 1
+            self._queue.put(job_id)
+
+    def shutdown(self):
+        self._stopped.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._release()  # 저장소에는 queued 로 남아 다음 start() 때 재개
+        for _ in range(self.max_concurrency):
+            self._queue.put(None)
+        with self._lock:
+            running = list(self._running)
+        self.store.fail_running(running, "서버 종료로 작업이 중단되었습니다.")
+        for job_id in running:
+            print(f"[JOB] 서버 종료로 중단: {job_id}")
+
+    def submit(self, request):
+        # 개수 확인과 자리 예약을 같은 잠금 안에서 (동시 제출이 한꺼번에 확인을 통과하지 않도록)
+        with self._lock:
+            if self._active >= self.max_pending:
+                raise QueueFullError(f"대기 중인 작업이 너무 많습니다. (최대 {self.max_pending}개)")
+            self._active += 1
+        try:
+            job_id = self.store.create(request)
+        except Exception:
+            self._release()
+            raise
+        self._queue.put(job_id)
+        return job_id
+
+    def _release(self):
+        with self._lock:
+            self._active -= 1
+
+    def _fail_stale(self):
+        for job_id in self.store.fail_stale(self.stale_seconds, "작업 중 서버가 중단되었습니다."):
+            print(f"[JOB] 중단된 작업 실패 처리: {job_id}")
+
+    # ✅ heartbeat + 오래된 running 작업 정리 (다른 프로세스가 남긴 작업도 처리)
+    def _monitor(self):
+        while not self._stopped.wait(self.heartbeat_seconds):
+            try:
+                with self._lock:
+                    running = list(self._running)
+                self.store.touch(running)
+                self._fail_stale()
+            except Exception as e:
+                print(f"[JOB] heartbeat 실패 ({e})")
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            if job_id is None:
+                return
+            self._run(job_id)
+
+    def _run(self, job_id):
+        try:
+            job = self.store.get(job_id) if self.store.claim(job_id, QUEUED, RUNNING) else None
+        except Exception as e:
+            print(f"[JOB] 작업 시작 실패: {job_id} ({e})")
+            job = None
+        if job is None:  # 다른 프로세스가 이미 가져갔거나 시작하지 못한 작업
+            self._release()
+            return
+
+        with self._lock:
+            self._running.add(job_id)
+        progress = job["progress"]
+        progress_lock = threading.Lock()
+
+        def report(stage, done, total):
+            with progress_lock:
+                progress[stage] = {"done": done, "total": total}
+                self.store.update(job_id, stage=stage, progress=progress)
+
+        try:
+            result = self.runner(job["request"], report)
+            self.store.update(job_id, status=DONE, result=result)
+        except Exception as e:
+            print(f"[JOB] 작업 실패: {job_id} ({e})")
+            self.store.update(job_id, status=FAILED, error=str(e))
+        finally:
+            with self._lock:
+                self._running.discard(job_id)
+            self._release()
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# ✅ GPT 응답 캐시 설정
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "1") == "1"
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL_DAYS", "14")) * 86400
+# 이 값보다 temperature 가 높으면 같은 입력이라도 답이 달라지는 설정으로 보고 캐시 사용 안 함
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2"))
+EVICT_EVERY = 100  # put 몇 번마다 용량 검사
+
+# 응답 내용에 영향을 주는 요청 인자 (키 계산에 포함)
+KEY_FIELDS = ("model", "temperature", "messages", "response_format", "top_p", "seed", "max_tokens")
+
+
+# ✅ 같은 입력이면 같은 답을 기대할 수 있는 요청만 캐시
+def is_cacheable(kwargs):
+    if kwargs.get("stream") or kwargs.get("n", 1) != 1:
+        return False
+    return kwargs.get("temperature", 1.0) <= LLM_CACHE_MAX_TEMPERATURE
+
+
+def request_key(kwargs):
+    payload = {field: kwargs[field] for field in KEY_FIELDS if field in kwargs}
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LlmCache:
+    """
+    GPT chat completion 응답 캐시 (SQLite)
+    - 키: (model, temperature, messages, response_format 등) 해시
+    - TTL이 지난 항목은 미스, 전체 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 삭제
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+        self._conn.commit()
+
+    # ✅ 조회 (없거나 만료면 None, 응답은 ChatCompletion JSON 문자열)
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, model, response):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, len(response.encode("utf-8")), now, now),
+            )
+            self._conn.commit()
+            self._puts += 1
+            if self._puts % EVICT_EVERY == 0:
+                self._evict()
+
+    def record_bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total > self.max_bytes:
+            # 오래 안 쓴 항목부터 누적 크기가 초과분을 넘을 때까지 삭제
+            excess = total - self.max_bytes
+            removed = 0
+            keys = []
+            for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY accessed_at"):
+                keys.append((key,))
+                removed += size
+                if removed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", keys)
+        self._conn.commit()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "size_bytes": size,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 GPT 응답 캐시 (비활성화 시 None)
+def get_llm_cache():
+    global _cache
+    if not LLM_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LlmCache()
+        return _cache
@@ -0,0 +1,115 @@
+import re
+from collections import Counter
+from typing import List, Dict
+
+# 주소 정규화 시 통일할 행정구역 표기
+REGION_ALIASES = {
+    "서울특별시": "서울", "서울시": "서울",
+    "부산광역시": "부산", "부산시": "부산",
+    "대구광역시": "대구", "인천광역시": "인천",
+    "광주광역시": "광주", "대전광역시": "대전",
+    "울산광역시": "울산", "세종특별자치시": "세종",
+    "경기도": "경기", "강원도": "강원", "강원특별자치도": "강원",
+    "충청북도": "충북", "충청남도": "충남",
+    "전라북도": "전북", "전북특별자치도": "전북", "전라남도": "전남",
+    "경상북도": "경북", "경상남도": "경남",
+    "제주특별자치도": "제주", "제주도": "제주",
+}
+
+
+# ✅ 장소명 정규화 (공백/기호 제거, 소문자)
+def normalize_place_name(name):
+    return re.sub(r"[\s\W_]+", "", str(name)).lower()
+
+
+# ✅ 주소 정규화 (행정구역 표기 통일, 공백/기호 제거)
+def normalize_address(address):
+    tokens = [REGION_ALIASES.get(token, token) for token in str(address).split()]
+    return re.sub(r"[\s,.()·-]+", "", "".join(tokens)).lower()
+
+
+def _has_specific_address(address):
+    return bool(re.search(r"\d", str(address)))
+
+
+def to_keyword_list(value):
+    if isinstance(value, list):
+        items = value
+    elif isinstance(value, str):
+        items = value.split(",")
+    else:
+        items = []
+    return [str(item).strip() for item in items if str(item).strip()]
+
+
+def _union(lists):
+    seen = []
+    for items in lists:
+        for item in items:
+            if item not in seen:
+                seen.append(item)
+    return seen
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _merge_group(rows, blog_weights=None):
+    addresses = [row.get("주소", "") for row in rows if row.get("주소")]
+    specific = [address for address in addresses if _has_specific_address(address)]
+    countries = Counter(row.get("국가", "") for row in rows if row.get("국가"))
+    names = Counter(row.get("장소명", "") for row in rows if row.get("장소명"))
+    descriptions = [row.get("설명", "") for row in rows if row.get("설명")]
+
+    return {
+        "장소명": names.most_common(1)[0][0] if names else "",
+        "설명": max(descriptions, key=len) if descriptions else "",
+        "주소": max(specific or addresses, key=len) if addresses else "",
+        "국가": countries.most_common(1)[0][0] if countries else "",
+        "언급 블로그 수": sum(blog_weights[blog] if blog_weights else 1 for blog in {row["_blog"] for row in rows}),
+        "키워드": ", ".join(_union(to_keyword_list(row.get("키워드")) for row in rows)),
+        "추가정보": ", ".join(_union(to_keyword_list(row.get("추가정보")) for row in rows)),
+        "체류시간": max(_to_float(row.get("체류시간")) for row in rows),
+    }
+
+
+def merge_location_rows(rows_per_blog: List[List[Dict]], blog_weights: List[int] = None) -> List[Dict]:
+    """
+    블로그별로 따로 뽑은 장소 행들을 하나로 병합 (입력 순서가 같으면 결과도 항상 같음)
+    - 정규화한 주소(번지까지 있는 경우) 또는 정규화한 장소명이 같으면 같은 장소로 간주
+    - 언급 블로그 수는 해당 장소가 나온 블로그 수 (blog_weights 를 주면 블로그별 가중치 합, 예: 유사 중복 묶음 크기)
+    - 키워드/추가정보는 중복 없이 합침
+    - 설명은 가장 긴 것, 주소는 가장 구체적인 것, 체류시간은 최댓값 사용
+    """
+    groups = []
+    by_name = {}
+    by_address = {}
+
+    for blog_index, rows in enumerate(rows_per_blog):
+        for row in rows:
+            name_key = normalize_place_name(row.get("장소명", ""))
+            address = row.get("주소", "")
+            address_key = normalize_address(address) if _has_specific_address(address) else ""
+            if not name_key and not address_key:
+                continue
+
+            group_index = by_address.get(address_key) if address_key else None
+            if group_index is None and name_key:
+                group_index = by_name.get(name_key)
+            if group_index is None:
+                group_index = len(groups)
+                groups.append([])
+
+            groups[group_index].append({**row, "_blog": blog_index})
+            if name_key:
+                by_name.setdefault(name_key, group_index)
+            if address_key:
+                by_address.setdefault(address_key, group_index)
+
+    merged = [_merge_group(rows, blog_weights) for rows in groups]
+    merged.sort(key=lambda row: -row["언급 블로그 수"])
+    return merged
@@ -0,0 +1,93 @@
+import re
+import json
+from typing import List, Dict
+
+# ✅ 구조화 출력 스키마 키 → 기존 표/JSON 칼럼명
+FIELD_NAMES = {
+    "name": "장소명",
+    "description": "설명",
+    "address": "주소",
+    "country": "국가",
+    "mentionCount": "언급 블로그 수",
+    "keywords": "키워드",
+    "extraInfo": "추가정보",
+    "durationHours": "체류시간",
+}
+
+FIELD_TYPES = {
+    "name": {"type": "string"},
+    "description": {"type": "string"},
+    "address": {"type": "string"},
+    "country": {"type": "string"},
+    "mentionCount": {"type": "integer"},
+    "keywords": {"type": "array", "items": {"type": "string"}},
+    "extraInfo": {"type": "array", "items": {"type": "string"}},
+    "durationHours": {"type": "number"},
+}
+
+
+# ✅ OpenAI 구조화 출력(response_format) 스키마
+# - with_mention_count=False 이면 블로그 하나 단위 추출용 (언급 수는 로컬 병합에서 계산)
+def location_response_format(with_mention_count=True):
+    fields = [field for field in FIELD_TYPES if with_mention_count or field != "mentionCount"]
+    item = {
+        "type": "object",
+        "properties": {field: FIELD_TYPES[field] for field in fields},
+        "required": fields,
+        "additionalProperties": False,
+    }
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "filming_locations",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"locations": {"type": "array", "items": item}},
+                "required": ["locations"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+# ✅ 구조화 출력 JSON → 기존 칼럼명 dict 목록
+def parse_location_rows(raw_json: str) -> List[Dict]:
+    try:
+        locations = json.loads(raw_json).get("locations", []) if raw_json else []
+    except (json.JSONDecodeError, AttributeError):
+        print("❌ 구조화 출력 JSON 파싱 실패:\n", raw_json)
+        return []
+    return [
+        {FIELD_NAMES[key]: value for key, value in location.items() if key in FIELD_NAMES}
+        for location in locations
+        if isinstance(location, dict)
+    ]
+
+
+# ✅ 기존 칼럼명 dict 목록 → 구조화 출력 JSON (누적 결과를 다시 프롬프트로 넘길 때 사용)
+def rows_to_location_json(rows: List[Dict]) -> str:
+    keys = {column: key for key, column in FIELD_NAMES.items()}
+    locations = [{keys[column]: value for column, value in row.items() if column in keys} for row in rows]
+    return json.dumps({"locations": locations}, ensure_ascii=False)
+
+
+def is_clear_address(address) -> bool:
+    """
+    주소가 명확한지 판단
+    - '로' 또는 '길'이 포함되고, 숫자가 있고, '동'으로 끝나지 않아야 명확함
+      예: '서울 성북구' → 불분명 / '서울 성북구 삼선동' → 불분명 / '서울 마포구 손기정로 32' → 명확함
+    """
+    address = str(address or "").strip()
+    if "로" not in address and "길" not in address:
+        return False
+    if not re.search(r"\d", address):
+        return False
+    return not address.endswith("동")
+
+
+# ✅ 주소가 불분명한 항목 제거
+def filter_clear_addresses(rows: List[Dict]) -> List[Dict]:
+    kept = [row for row in rows if is_clear_address(row.get("주소"))]
+    print(f"[FILTER] 주소 불분명 {len(rows) - len(kept)}개 제거 → {len(kept)}개")
+    return kept
@@ -1,4 +1,7 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict
 import logging
@@ -7,10 +10,20 @@ import time
 import json
 import requests
 import os
+import queue
+import threading
 from dotenv import load_dotenv
 
 from extract_movie import extract_all_info_from_movie
-from analyze_with_gpt import run_pipeline
+from analyze_with_gpt import run_pipeline, GPT_PIPELINE_MODE
+from pipeline_context import PipelineContext
+from result_cache import get_result_cache, result_key
+from jobs import JobQueue, QueueFullError, DONE, FAILED
+import model_registry
+from gpt_client import get_gpt_metrics
+from llm_cache import get_llm_cache
+from ocr_stage import get_ocr_stats
+from ner_gate import get_gate_stats
 
 # ✅ 로깅 설정
 logging.basicConfig(
@@ -22,7 +35,21 @@ logger = logging.getLogger(__name__)
 # ✅ 환경 변수 로딩
 load_dotenv()
 
-app = FastAPI()
+
+# ✅ 서버 시작 시 MODEL_WARMUP 에 지정된 모델/클라이언트 미리 로딩 + 작업 큐 생성/복구
+# - 작업 큐는 import 시점이 아니라 서버 프로세스에서만 만듦 (리로더/벤치마크 등 main 을 import 만 하는 프로세스 제외)
+@asynccontextmanager
+async def lifespan(app):
+    global job_queue
+    job_queue = JobQueue(run_location_job)
+    await run_in_threadpool(job_queue.start)
+    await run_in_threadpool(model_registry.warm_up)
+    logger.info(f"📦 모델 준비 상태: {model_registry.readiness()}")
+    yield
+    job_queue.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # ✅ 요청 DTO
 class MovieInfoRequestDto(BaseModel):
@@ -73,19 +100,40 @@ class FilmingLocationResponseDto(BaseModel):
     movieId: int
     locations: List[LocationInfo]
 
+# ✅ 크롤링 + GPT 파이프라인 실행 → 장소 dict 목록
+# - progress(stage, done, total): 단계별 진행 상황 콜백
+# - on_partial(rows): 블로그를 처리할 때마다 잠정 장소 목록 콜백 (스트리밍 응답용)
+def extract_locations(title, progress=None, on_partial=None):
+    # 1. 로컬에서 직접 블로그 크롤링
+    all_blogs = extract_all_info_from_movie(title, max_results=30, progress=progress)
+    logger.info(f"✅ 받은 블로그 수: {len(all_blogs)}")
+
+    # 2. GPT로 장소 정보 추출 및 정제 (요청별 컨텍스트 → 동시 요청끼리 누적 결과가 섞이지 않음)
+    ctx = PipelineContext(title, GPT_PIPELINE_MODE, progress, on_partial)
+    raw_locations = run_pipeline(all_blogs, title, save_to_file=False, ctx=ctx)
+    logger.info(f"📌 GPT 파이프라인 완료 - 장소 후보 수: {len(raw_locations)} ({ctx.summary()})")
+    return raw_locations
+
+# ✅ 캐시/요청 합치기를 거쳐 장소 dict 목록 반환
+def get_locations(movie_id, title, force_refresh=False, progress=None, on_partial=None):
+    cache = get_result_cache()
+    if cache is None:
+        return extract_locations(title, progress, on_partial)
+    return cache.get_or_compute(
+        result_key(movie_id, title),
+        lambda: extract_locations(title, progress, on_partial),
+        force_refresh=force_refresh,
+    )
+
 # ✅ 통합형 크롤링 + GPT 처리 엔드포인트
+# - 같은 영화는 결과 캐시 사용, 동시에 들어온 같은 영화 요청은 한 번만 처리
+# - force_refresh=true 이면 캐시를 무시하고 다시 처리
 @app.post("/movies", response_model=FilmingLocationResponseDto)
-def get_filming_locations(request: MovieInfoRequestDto):
+def get_filming_locations(request: MovieInfoRequestDto, force_refresh: bool = False):
     try:
         logger.info(f"🎬 영화 제목 수신: {request.title}")
 
-        # 1. 로컬에서 직접 블로그 크롤링
-        all_blogs = extract_all_info_from_movie(request.title, max_results=30)
-        logger.info(f"✅ 받은 블로그 수: {len(all_blogs)}")
-
-        # 2. GPT로 장소 정보 추출 및 정제
-        raw_locations = run_pipeline(all_blogs, request.title, save_to_file=False)
-        logger.info(f"📌 GPT 파이프라인 완료 - 장소 후보 수: {len(raw_locations)}")
+        raw_locations = get_locations(request.id, request.title, force_refresh)
 
         # 3. 변환 및 응답
         locations = convert_to_location_info(raw_locations)
@@ -97,7 +145,126 @@ def get_filming_locations(request: MovieInfoRequestDto):
         logger.exception("🔥 영화 장소 추출 중 예외 발생!")
         return {"error": "서버 처리 중 오류가 발생했습니다."}
 
+# ✅ 스트리밍 응답 (NDJSON 또는 SSE)
+# - progress: 단계별 진행 상황 / partial: 지금까지의 잠정 장소 목록 (매번 전체 목록, 받은 쪽은 교체)
+# - result: 최종 장소 목록 (POST /movies 응답과 같은 형식) / error: 처리 실패
+# - 이벤트가 STREAM_KEEPALIVE_SECONDS 동안 없으면 연결 유지용 ping 전송
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+
+def format_stream_event(event, fmt):
+    data = json.dumps(event, ensure_ascii=False)
+    if fmt == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
+
+@app.post("/movies/stream")
+def stream_filming_locations(request: MovieInfoRequestDto, force_refresh: bool = False, format: str = "ndjson"):
+    logger.info(f"🎬 스트리밍 요청 수신: {request.title}")
+    fmt = "sse" if format == "sse" else "ndjson"
+    events = queue.Queue()
+
+    def progress(stage, done, total):
+        events.put({"type": "progress", "stage": stage, "done": done, "total": total})
+
+    def on_partial(rows):
+        locations = convert_to_location_info(rows)
+        events.put({"type": "partial", "locations": [location.model_dump() for location in locations]})
+
+    def run():
+        try:
+            raw_locations = get_locations(request.id, request.title, force_refresh, progress, on_partial)
+            response = FilmingLocationResponseDto(movieId=request.id, locations=convert_to_location_info(raw_locations))
+            logger.info(f"📦 스트리밍 최종 장소 수: {len(response.locations)}")
+            events.put({"type": "result", **response.model_dump()})
+        except Exception:
+            logger.exception("🔥 스트리밍 장소 추출 중 예외 발생!")
+            events.put({"type": "error", "error": "서버 처리 중 오류가 발생했습니다."})
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, daemon=True).start()
+
+    def generate():
+        while True:
+            try:
+                event = events.get(timeout=STREAM_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                yield ": ping\n\n" if fmt == "sse" else format_stream_event({"type": "ping"}, fmt)
+                continue
+            if event is None:
+                return
+            yield format_stream_event(event, fmt)
+
+    media_type = "text/event-stream" if fmt == "sse" else "application/x-ndjson"
+    return StreamingResponse(generate(), media_type=media_type)
+
+# ✅ 비동기 작업 API (작업 제출 → 상태 조회 → 결과 조회)
+def run_location_job(request, progress):
+    return get_locations(request["id"], request["title"], request.get("forceRefresh", False), progress)
+
+job_queue = None  # lifespan 에서 생성
+
+class JobSubmitResponseDto(BaseModel):
+    jobId: str
+    status: str
+
+@app.post("/movies/jobs", response_model=JobSubmitResponseDto, status_code=202)
+def submit_filming_locations_job(request: MovieInfoRequestDto, force_refresh: bool = False):
+    logger.info(f"🎬 작업 요청 수신: {request.title}")
+    payload = request.model_dump()
+    payload["forceRefresh"] = force_refresh
+    try:
+        job_id = job_queue.submit(payload)
+    except QueueFullError as e:
+        return JSONResponse(status_code=429, content={"error": str(e)})
+    return JobSubmitResponseDto(jobId=job_id, status="queued")
+
+@app.get("/movies/jobs/{job_id}")
+def get_job_status(job_id: str):
+    job = job_queue.store.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "작업을 찾을 수 없습니다."})
+    return {
+        "jobId": job["id"],
+        "movieId": job["request"]["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "error": job["error"],
+    }
+
+@app.get("/movies/jobs/{job_id}/result", response_model=FilmingLocationResponseDto)
+def get_job_result(job_id: str):
+    job = job_queue.store.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "작업을 찾을 수 없습니다."})
+    if job["status"] == FAILED:
+        return JSONResponse(status_code=500, content={"error": "서버 처리 중 오류가 발생했습니다."})
+    if job["status"] != DONE:
+        return JSONResponse(status_code=409, content={"error": "작업이 아직 끝나지 않았습니다.", "status": job["status"]})
+    locations = convert_to_location_info(job["result"])
+    return FilmingLocationResponseDto(movieId=job["request"]["id"], locations=locations)
+
 # ✅ 헬스 체크용 엔드포인트
 @app.get("/healthz")
 def health_check():
     return {"status": "ok"}
+
+
+# ✅ 모델 로딩 상태 (MODEL_WARMUP 항목이 모두 로딩되면 ready)
+@app.get("/readyz")
+def readiness_check():
+    status = model_registry.readiness()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
+
+# ✅ 단계별 누적 지표 (GPT 호출 지연/토큰/재시도, GPT 응답 캐시 적중률, OCR, NER 게이트)
+@app.get("/metrics")
+def metrics():
+    llm_cache = get_llm_cache()
+    return {
+        "gpt": get_gpt_metrics(),
+        "llmCache": llm_cache.stats() if llm_cache is not None else None,
+        "ocr": get_ocr_stats(),
+        "nerGate": get_gate_stats(),
+    }
@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+
+# ✅ 모델/클라이언트 레지스트리 설정
+MODEL_WARMUP = [name.strip() for name in os.getenv("MODEL_WARMUP", "").split(",") if name.strip()]
+PROMPT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "초기_프롬프트.txt")
+
+_started_at = time.time()
+_warmup_seconds = None
+_instances = {}
+_timings = {}
+_lock = threading.Lock()
+_loading_locks = {}
+
+
+def _load_ner():
+    from ner_inference import load_ner_pipeline
+    return load_ner_pipeline()
+
+
+# 재시도/동시성 제한은 gpt_client 에서 처리 (SDK 자체 재시도는 끔)
+def _load_openai():
+    from openai import AsyncOpenAI
+    from dotenv import load_dotenv
+    load_dotenv()
+    return AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL") or None,
+        timeout=float(os.getenv("GPT_TIMEOUT", "120")),
+        max_retries=0,
+    )
+
+
+def _load_prompt():
+    with open(PROMPT_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+LOADERS = {
+    "ner": _load_ner,
+    "openai": _load_openai,
+    "prompt": _load_prompt,
+}
+
+
+# ✅ 처음 사용할 때 한 번만 로딩 (프로세스 단위 공유)
+def get(name):
+    instance = _instances.get(name)
+    if instance is not None:
+        return instance
+
+    with _lock:
+        loading_lock = _loading_locks.setdefault(name, threading.Lock())
+    with loading_lock:
+        if name not in _instances:
+            start = time.perf_counter()
+            _instances[name] = LOADERS[name]()
+            _timings[name] = {
+                "load_seconds": round(time.perf_counter() - start, 3),
+                "loaded_after_startup_seconds": round(time.time() - _started_at, 3),
+            }
+            print(f"[REGISTRY] {name} 로딩 완료 ({_timings[name]['load_seconds']}s)")
+        return _instances[name]
+
+
+def get_ner():
+    return get("ner")
+
+
+def get_openai_client():
+    return get("openai")
+
+
+def get_initial_prompt():
+    return get("prompt")
+
+
+# ✅ 서버 시작 시 미리 로딩 (MODEL_WARMUP="ner,openai,prompt")
+def warm_up(names=None):
+    global _warmup_seconds
+    start = time.perf_counter()
+    for name in names if names is not None else MODEL_WARMUP:
+        try:
+            get(name)
+        except Exception as e:
+            print(f"[REGISTRY] {name} 미리 로딩 실패: {e}")
+    _warmup_seconds = round(time.perf_counter() - start, 3)
+
+
+# ✅ 준비 상태 (로딩된 항목과 소요시간)
+def readiness():
+    return {
+        "uptime_seconds": round(time.time() - _started_at, 3),
+        "loaded": sorted(_instances),
+        "warmup": MODEL_WARMUP,
+        "ready": all(name in _instances for name in MODEL_WARMUP),
+        "warmup_seconds": _warmup_seconds,
+        "timings": dict(_timings),
+    }
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List
-from extract_movie import extract_all_info_from_movie  # 같은 파일에 있으면 직접 호출 가능
+from extract_movie import extract_all_info_from_movie, iter_info_from_movie  # 같은 파일에 있으면 직접 호출 가능
+import json
 import uvicorn
 
 app = FastAPI()
@@ -9,10 +11,21 @@ app = FastAPI()
 class CrawlRequest(BaseModel):
     title: str
     max_results: int = 50  # 기본값 설정
+    stream: bool = False  # True 이면 블로그 하나 추출될 때마다 NDJSON 한 줄씩 전송
+
+# ✅ 블로그 본문 추출 완료 순서대로 {"url", "본문"} 한 줄씩 전송
+def stream_movie_info(request: CrawlRequest):
+    count = 0
+    for _, info in iter_info_from_movie(request.title, max_results=request.max_results):
+        count += 1
+        yield json.dumps(info, ensure_ascii=False) + "\n"
+    print(f"[✅] 스트리밍 크롤링 완료, 총 {count}건")
 
 @app.post("/crawl")
 def crawl_movie_info(request: CrawlRequest):
     print(f"[📥] 요청 수신: {request.title} ({request.max_results})")
+    if request.stream:
+        return StreamingResponse(stream_movie_info(request), media_type="application/x-ndjson")
     results = extract_all_info_from_movie(request.title, max_results=request.max_results)
     print(f"[✅] 크롤링 완료, 총 {len(results)}건")
     return results
@@ -0,0 +1,144 @@
+import os
+import asyncio
+import threading
+import httpx
+from collections import namedtuple
+from lxml import etree
+from lxml import html as lxml_html
+from urllib.parse import urlparse, parse_qs
+
+# ✅ HTTP 경로 설정
+NAVER_HTTP_TIMEOUT = float(os.getenv("NAVER_HTTP_TIMEOUT", "10"))
+NAVER_HTTP_CONCURRENCY = int(os.getenv("NAVER_HTTP_CONCURRENCY", "8"))
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Referer": "https://blog.naver.com/",
+    "Accept-Language": "ko-KR,ko;q=0.9",
+}
+# 블로그 하나의 요청/파싱 실패 (빈 본문이면 lxml 이 ParserError → ValueError 가 아님)
+FETCH_ERRORS = (httpx.HTTPError, ValueError, etree.LxmlError)
+POSTVIEW_URL = "https://blog.naver.com/PostView.naver?blogId={blog_id}&logNo={log_no}&redirect=Dlog&widgetTypeCall=true&directAccess=false"
+
+# PostView 응답 (html=None 이면 요청 실패, not_modified=True 이면 조건부 요청 결과 변경 없음)
+PostViewDocument = namedtuple("PostViewDocument", ["html", "etag", "last_modified", "not_modified"])
+FAILED_DOCUMENT = PostViewDocument(None, None, None, False)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 HTTP 클라이언트 (커넥션 풀 재사용)
+def get_http_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = httpx.Client(
+                headers=HEADERS,
+                timeout=NAVER_HTTP_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=NAVER_HTTP_CONCURRENCY * 2, max_keepalive_connections=NAVER_HTTP_CONCURRENCY),
+            )
+        return _client
+
+
+# ✅ blog.naver.com URL → PostView URL 변환 (알 수 없는 형식이면 None)
+def resolve_postview_url(url):
+    parsed = urlparse(url)
+    if not parsed.netloc.endswith("blog.naver.com"):
+        return None
+
+    query = parse_qs(parsed.query)
+    blog_id = query.get("blogId", [None])[0]
+    log_no = query.get("logNo", [None])[0]
+
+    parts = [p for p in parsed.path.split("/") if p]
+    if not blog_id and parts and not parts[0].endswith(".naver"):
+        blog_id = parts[0]
+    if not log_no and len(parts) >= 2 and parts[1].isdigit():
+        log_no = parts[1]
+
+    if not blog_id or not log_no:
+        return None
+    return POSTVIEW_URL.format(blog_id=blog_id, log_no=log_no)
+
+
+# ✅ 메인 페이지 HTML에서 mainFrame iframe 주소 찾기
+def find_main_frame_url(page_html, base_url):
+    tree = lxml_html.fromstring(page_html, base_url=base_url)
+    tree.make_links_absolute(base_url)
+    src = tree.xpath("//iframe[@id='mainFrame' or @name='mainFrame']/@src")
+    return src[0] if src else None
+
+
+def _conditional_headers(etag=None, last_modified=None):
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+def _to_document(response):
+    if response.status_code == 304:
+        return PostViewDocument(None, None, None, True)
+    response.raise_for_status()
+    return PostViewDocument(response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"), False)
+
+
+# ✅ PostView 문서 가져오기 (동기, 실패 시 html=None)
+# - etag/last_modified를 주면 조건부 요청 (변경 없으면 not_modified=True)
+def fetch_postview(url, etag=None, last_modified=None):
+    client = get_http_client()
+    try:
+        target = resolve_postview_url(url)
+        if target is None:
+            response = client.get(url)
+            response.raise_for_status()
+            target = find_main_frame_url(response.text, str(response.url))
+            if target is None:
+                return FAILED_DOCUMENT
+        return _to_document(client.get(target, headers=_conditional_headers(etag, last_modified)))
+    except FETCH_ERRORS as e:
+        print(f"[HTTP] PostView 요청 실패: {url} ({e})")
+        return FAILED_DOCUMENT
+
+
+# ✅ PostView 문서 가져오기 (비동기, 실패 시 html=None)
+async def fetch_postview_async(client, url, etag=None, last_modified=None):
+    try:
+        target = resolve_postview_url(url)
+        if target is None:
+            response = await client.get(url)
+            response.raise_for_status()
+            target = find_main_frame_url(response.text, str(response.url))
+            if target is None:
+                return FAILED_DOCUMENT
+        return _to_document(await client.get(target, headers=_conditional_headers(etag, last_modified)))
+    except FETCH_ERRORS as e:
+        print(f"[HTTP] PostView 요청 실패: {url} ({e})")
+        return FAILED_DOCUMENT
+
+
+# ✅ 여러 블로그를 동시에 가져오기
+# - targets: (url, etag, last_modified) 목록, 입력 순서대로 PostViewDocument 반환
+async def fetch_postviews(targets, concurrency=NAVER_HTTP_CONCURRENCY):
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(headers=HEADERS, timeout=NAVER_HTTP_TIMEOUT, follow_redirects=True, limits=limits) as client:
+        async def fetch(url, etag, last_modified):
+            async with semaphore:
+                return await fetch_postview_async(client, url, etag, last_modified)
+
+        # 예상 못 한 예외도 해당 블로그만 실패 처리 (나머지는 그대로, 실패한 블로그는 Selenium 경로로 대체)
+        results = await asyncio.gather(*(fetch(*request) for request in targets), return_exceptions=True)
+
+    documents = []
+    for (url, _, _), result in zip(targets, results):
+        if isinstance(result, BaseException):
+            print(f"[HTTP] PostView 요청 실패: {url} ({result!r})")
+            result = FAILED_DOCUMENT
+        documents.append(result)
+    return documents
@@ -0,0 +1,82 @@
+import os
+import threading
+from collections import namedtuple
+
+from text_signals import count_addresses, location_score
+from token_budget import split_into_chunks
+from model_registry import get_ner
+from ner_inference import NER_BATCH_SIZE
+
+# ✅ NER 사전 필터 설정
+# - off: 사용 안 함 / shadow: 건너뛸 블로그를 로그로만 남김 / on: 실제로 GPT 호출 생략
+NER_GATE_MODE = os.getenv("NER_GATE_MODE", "shadow")
+NER_GATE_MIN_SCORE = float(os.getenv("NER_GATE_MIN_SCORE", "0"))
+
+# 블로그별 판정 결과 (loc_counts: token_budget.split_into_chunks 청크별 LOC 개체 수)
+GateResult = namedtuple("GateResult", ["passed", "score", "loc_count", "address_count", "loc_counts"])
+
+_lock = threading.Lock()
+_stats = {"scored": 0, "skipped": 0, "shadow_skipped": 0, "errors": 0}
+
+
+# ✅ 모든 블로그의 청크를 한 번에 배치 NER → 청크별 LOC 개수
+def _count_locs(chunks):
+    if not chunks:
+        return []
+    results = get_ner()(chunks, batch_size=NER_BATCH_SIZE)
+    return [sum(1 for e in entities if e["entity_group"] == "LOC") for entities in results]
+
+
+def _pass_all(blog_texts):
+    return [GateResult(True, 0, 0, 0, None) for _ in blog_texts]
+
+
+def gate_blogs(blog_texts, mode=None):
+    """
+    블로그별 장소 관련성 점수로 GPT 호출 여부 판정 → GateResult 목록 (입력 순서)
+    - LOC 개체와 주소 패턴이 하나도 없거나 점수가 NER_GATE_MIN_SCORE 미만이면 탈락
+    - shadow 모드에서는 탈락 대상을 로그만 남기고 passed=True 로 돌려줌
+    - NER 모델을 불러오거나 실행하지 못하면 모드와 관계없이 모두 통과 (get_gate_stats 의 errors 로 확인)
+    """
+    mode = mode or NER_GATE_MODE
+    if mode == "off":
+        return _pass_all(blog_texts)
+
+    try:
+        chunks_per_blog = [split_into_chunks(text) for text in blog_texts]
+        flat_counts = _count_locs([chunk for chunks in chunks_per_blog for chunk in chunks])
+    except Exception as e:
+        # 모델 다운로드/로딩/추론 실패 → 게이트 없이 진행 (사전 필터 실패로 요청 전체가 실패하지 않도록)
+        with _lock:
+            _stats["errors"] += 1
+        print(f"[NER GATE] 판정 실패 → 블로그 {len(blog_texts)}개 모두 통과 ({mode}): {e}")
+        return _pass_all(blog_texts)
+
+    results = []
+    offset = 0
+    skipped = []
+    for i, (text, chunks) in enumerate(zip(blog_texts, chunks_per_blog), 1):
+        loc_counts = flat_counts[offset:offset + len(chunks)]
+        offset += len(chunks)
+        loc_count = sum(loc_counts)
+        address_count = count_addresses(text)
+        score = location_score(text, loc_count)
+        passed = (loc_count + address_count) > 0 and score >= NER_GATE_MIN_SCORE
+        if not passed:
+            skipped.append(i)
+        results.append(GateResult(passed or mode == "shadow", score, loc_count, address_count, loc_counts))
+
+    with _lock:
+        _stats["scored"] += len(blog_texts)
+        _stats["shadow_skipped" if mode == "shadow" else "skipped"] += len(skipped)
+
+    if skipped:
+        action = "건너뛸 예정(shadow)" if mode == "shadow" else "GPT 호출 생략"
+        print(f"[NER GATE] 블로그 {len(blog_texts)}개 중 {len(skipped)}개 {action}: {skipped}")
+    return results
+
+
+# ✅ 누적 판정 통계 (판정 수, 생략 수, shadow 모드에서 생략됐을 수, 판정 실패 수)
+def get_gate_stats():
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,92 @@
+import os
+
+# ✅ NER 추론 설정
+# - fp32: 기본 torch 모델 / int8: torch 동적 양자화(Linear 레이어) / onnx: ONNX Runtime CPU (optimum 필요)
+NER_MODEL_NAME = "Leo97/KoELECTRA-small-v3-modu-ner"
+NER_BACKEND = os.getenv("NER_BACKEND", "fp32")
+NER_BATCH_SIZE = int(os.getenv("NER_BATCH_SIZE", "16"))
+NER_WINDOW_STRIDE = int(os.getenv("NER_WINDOW_STRIDE", "64"))  # 윈도우 간 겹치는 토큰 수
+NER_ONNX_DIR = os.getenv("NER_ONNX_DIR", "cache/ner-onnx")
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))  # 0이면 torch 기본값 사용
+
+BACKENDS = ("fp32", "int8", "onnx")
+
+
+def _load_onnx_model():
+    try:
+        from optimum.onnxruntime import ORTModelForTokenClassification
+    except ImportError:
+        print("[NER] optimum[onnxruntime] 미설치 → fp32 모델 사용")
+        return None
+    if os.path.isdir(NER_ONNX_DIR):
+        return ORTModelForTokenClassification.from_pretrained(NER_ONNX_DIR)
+    # 처음 한 번만 ONNX로 변환해서 저장
+    model = ORTModelForTokenClassification.from_pretrained(NER_MODEL_NAME, export=True)
+    model.save_pretrained(NER_ONNX_DIR)
+    return model
+
+
+def _load_model(backend):
+    import torch
+    from transformers import AutoModelForTokenClassification
+
+    if backend == "onnx":
+        model = _load_onnx_model()
+        if model is not None:
+            return model
+        backend = "fp32"
+
+    model = AutoModelForTokenClassification.from_pretrained(NER_MODEL_NAME)
+    model.eval()
+    if backend == "int8":
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+
+def load_ner_pipeline(backend=None, windowed=True):
+    """
+    CPU용 NER 파이프라인 생성
+    - windowed=True: 모델 최대 길이 윈도우로 나눠(NER_WINDOW_STRIDE 만큼 겹침) 배치로 추론하고,
+      겹치는 구간의 개체는 파이프라인이 원문 위치 기준으로 하나로 합침 (긴 본문도 잘리지 않음)
+    - windowed=False: 기존 방식 (입력 전체를 한 번에 추론, 벤치마크 기준선용)
+    - 반환값은 transformers pipeline 과 같은 방식으로 호출: ner(text) / ner([texts], batch_size=...)
+    """
+    import torch
+    from transformers import AutoTokenizer, pipeline
+
+    backend = backend or NER_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 NER_BACKEND: {backend} ({', '.join(BACKENDS)})")
+    if TORCH_NUM_THREADS > 0:
+        torch.set_num_threads(TORCH_NUM_THREADS)
+
+    tokenizer = AutoTokenizer.from_pretrained(NER_MODEL_NAME)
+    model = _load_model(backend)
+
+    kwargs = {}
+    if windowed:
+        # 토크나이저에 최대 길이가 없으면(기본값이 매우 큰 수) 모델 위치 임베딩 길이로 맞춤
+        max_positions = getattr(model.config, "max_position_embeddings", 512)
+        tokenizer.model_max_length = min(tokenizer.model_max_length, max_positions)
+        kwargs["stride"] = min(NER_WINDOW_STRIDE, tokenizer.model_max_length // 2)
+
+    ner = pipeline(
+        "ner",
+        model=model,
+        tokenizer=tokenizer,
+        aggregation_strategy="simple",
+        device=-1,
+        batch_size=NER_BATCH_SIZE,
+        **kwargs,
+    )
+    print(f"[NER] {backend} 백엔드 로딩 (윈도우: {'on' if windowed else 'off'})")
+    return ner
+
+
+# ✅ 개체 목록에서 (그룹, 단어) 집합 추출 (벤치마크 일치율 비교용)
+def entity_set(entities, groups=None):
+    return {
+        (e["entity_group"], e["word"].strip())
+        for e in entities
+        if groups is None or e["entity_group"] in groups
+    }
@@ -0,0 +1,145 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import pytesseract
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# ✅ OCR 캐시 설정
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE", "1") == "1"
+OCR_CACHE_PATH = os.getenv("OCR_CACHE_PATH", "cache/ocr_cache.sqlite3")
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+OCR_CACHE_TTL = float(os.getenv("OCR_CACHE_TTL_DAYS", "30")) * 86400
+OCR_CACHE_CONTENT_HASH = os.getenv("OCR_CACHE_CONTENT_HASH", "1") == "1"
+EVICT_EVERY = 200  # put 몇 번마다 용량 검사
+
+
+# ✅ 이미지 URL 정규화 (스킴/호스트 소문자, 프래그먼트 제거, 쿼리 정렬)
+def normalize_image_url(url):
+    parts = urlsplit(url.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def url_key(url):
+    return "url:" + hashlib.sha256(normalize_image_url(url).encode("utf-8")).hexdigest()
+
+
+def content_key(data):
+    return "sha:" + hashlib.sha256(data).hexdigest()
+
+
+_tesseract_version = None
+
+
+def get_tesseract_version():
+    global _tesseract_version
+    if _tesseract_version is None:
+        try:
+            _tesseract_version = str(pytesseract.get_tesseract_version())
+        except Exception:
+            _tesseract_version = "unknown"
+    return _tesseract_version
+
+
+class OcrCache:
+    """
+    이미지 해시 기반 OCR 결과 캐시 (SQLite)
+    - 키: 정규화한 이미지 URL 해시, 그리고 (옵션) 이미지 바이트 해시
+    - OCR 언어 / Tesseract 버전이 다르면 미스로 처리
+    - TTL이 지난 항목은 미스, 전체 텍스트 크기가 max_bytes를 넘으면 오래 안 쓴 항목부터 삭제
+    """
+
+    def __init__(self, path=OCR_CACHE_PATH, max_bytes=OCR_CACHE_MAX_BYTES, ttl=OCR_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ocr_cache (
+                key TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                lang TEXT NOT NULL,
+                tesseract_version TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_accessed ON ocr_cache (accessed_at)")
+        self._conn.commit()
+
+    # ✅ 조회 (없거나 만료/버전 불일치면 None)
+    def get(self, key, lang):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, lang, tesseract_version, created_at FROM ocr_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or row[1] != lang or row[2] != get_tesseract_version() or now - row[3] > self.ttl:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE ocr_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    # ✅ 저장 (여러 키에 같은 결과 저장 가능)
+    def put(self, keys, text, lang):
+        now = time.time()
+        size = len(text.encode("utf-8"))
+        rows = [(key, text, lang, get_tesseract_version(), size, now, now) for key in keys]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO ocr_cache VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            self._conn.commit()
+            self._puts += 1
+            if self._puts % EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        self._conn.execute("DELETE FROM ocr_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr_cache").fetchone()[0]
+        if total > self.max_bytes:
+            # 오래 안 쓴 항목부터 누적 크기가 초과분을 넘을 때까지 삭제
+            excess = total - self.max_bytes
+            removed = 0
+            keys = []
+            for key, size in self._conn.execute("SELECT key, size FROM ocr_cache ORDER BY accessed_at"):
+                keys.append((key,))
+                removed += size
+                if removed >= excess:
+                    break
+            self._conn.executemany("DELETE FROM ocr_cache WHERE key = ?", keys)
+        self._conn.commit()
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 OCR 캐시 (비활성화 시 None)
+def get_ocr_cache():
+    global _cache
+    if not OCR_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = OcrCache()
+        return _cache
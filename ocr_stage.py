@@ -0,0 +1,313 @@
+import os
+import time
+import threading
+import multiprocessing
+import requests
+import pytesseract
+import numpy as np
+from PIL import Image
+from io import BytesIO
+from requests.adapters import HTTPAdapter
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from ocr_cache import OCR_CACHE_CONTENT_HASH, get_ocr_cache, url_key, content_key
+
+# ✅ OCR 설정 (환경변수로 조정 가능)
+TESSERACT_CMD = os.getenv("TESSERACT_CMD", r"C:/Program Files/Tesseract-OCR/tesseract.exe")
+OCR_LANG = os.getenv("OCR_LANG", "kor")
+OCR_DOWNLOAD_CONCURRENCY = int(os.getenv("OCR_DOWNLOAD_CONCURRENCY", "8"))
+OCR_PROCESSES = int(os.getenv("OCR_PROCESSES", str(os.cpu_count() or 1)))
+OCR_DOWNLOAD_TIMEOUT = float(os.getenv("OCR_DOWNLOAD_TIMEOUT", "5"))
+OCR_IMAGE_TIMEOUT = float(os.getenv("OCR_IMAGE_TIMEOUT", "15"))
+OCR_BLOG_TIMEOUT = float(os.getenv("OCR_BLOG_TIMEOUT", "60"))
+MIN_IMAGE_SIZE = 100
+
+# ✅ OCR 전 사전 검사 설정
+PRESCREEN_ENABLED = os.getenv("OCR_PRESCREEN", "1") == "1"
+PRESCREEN_HEADER_BYTES = int(os.getenv("OCR_PRESCREEN_HEADER_BYTES", "65536"))
+PRESCREEN_MAX_ASPECT = float(os.getenv("OCR_PRESCREEN_MAX_ASPECT", "6"))
+PRESCREEN_SIZE = int(os.getenv("OCR_PRESCREEN_SIZE", "256"))
+PRESCREEN_EDGE_THRESHOLD = int(os.getenv("OCR_PRESCREEN_EDGE_THRESHOLD", "40"))
+PRESCREEN_MIN_EDGE_DENSITY = float(os.getenv("OCR_PRESCREEN_MIN_EDGE_DENSITY", "0.03"))
+
+# 사전 검사 탈락 사유
+SKIP_DIMENSION = "dimension"
+SKIP_NO_TEXT = "no_text"
+
+pytesseract.pytesseract.tesseract_cmd = TESSERACT_CMD
+
+_session = None
+_download_executor = None
+_ocr_executor = None
+_lock = threading.Lock()
+
+# 누적 통계 (OCR 평균 소요시간은 생략한 OCR 시간 추정에 사용)
+_stats = {"ocr_count": 0, "ocr_seconds": 0.0, "skipped": 0, "saved_seconds": 0.0}
+
+
+# ✅ 공용 HTTP 세션 (이미지 다운로드 커넥션 재사용)
+def get_session():
+    global _session
+    with _lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=OCR_DOWNLOAD_CONCURRENCY, pool_maxsize=OCR_DOWNLOAD_CONCURRENCY)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+# - OCR 프로세스 풀은 요청 스레드에서 처음 쓸 때 만들어지므로 spawn 으로 시작 (멀티스레드 프로세스에서 fork 하지 않음)
+def _get_executors():
+    global _download_executor, _ocr_executor
+    with _lock:
+        if _download_executor is None:
+            _download_executor = ThreadPoolExecutor(max_workers=OCR_DOWNLOAD_CONCURRENCY, thread_name_prefix="ocr-download")
+        if _ocr_executor is None:
+            _ocr_executor = ProcessPoolExecutor(
+                max_workers=max(1, OCR_PROCESSES), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _download_executor, _ocr_executor
+
+
+# ✅ OCR 작업 프로세스가 죽어(메모리 부족, Tesseract 비정상 종료 등) 풀이 망가지면 버리고 다음 작업 때 새로 만듦
+def _reset_ocr_executor(broken):
+    global _ocr_executor
+    with _lock:
+        if _ocr_executor is not broken:  # 다른 스레드가 이미 교체함
+            return
+        _ocr_executor = None
+    print("[OCR] OCR 프로세스 풀 손상 → 새로 생성")
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+# ✅ OCR 작업 제출 → (future, 제출한 풀)  (제출 시점에 풀이 망가져 있으면 새 풀에 다시 제출)
+def _submit_ocr(data):
+    executor = _get_executors()[1]
+    try:
+        return executor.submit(ocr_image_bytes, data, OCR_LANG, TESSERACT_CMD, OCR_IMAGE_TIMEOUT), executor
+    except BrokenProcessPool:
+        _reset_ocr_executor(executor)
+    executor = _get_executors()[1]
+    return executor.submit(ocr_image_bytes, data, OCR_LANG, TESSERACT_CMD, OCR_IMAGE_TIMEOUT), executor
+
+
+# ✅ 프로세스 풀에서 실행되는 OCR 작업 (디코딩 + 크기 확인 + Tesseract) → (텍스트, 소요초)
+def ocr_image_bytes(data, lang=OCR_LANG, tesseract_cmd=TESSERACT_CMD, timeout=OCR_IMAGE_TIMEOUT):
+    start = time.perf_counter()
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    img = Image.open(BytesIO(data))
+    if img.width < MIN_IMAGE_SIZE or img.height < MIN_IMAGE_SIZE:
+        return "", 0.0
+    text = pytesseract.image_to_string(img, lang=lang, timeout=timeout).strip()
+    return text, time.perf_counter() - start
+
+
+# ✅ 이미지 헤더만으로 크기 읽기 (읽을 수 없으면 None)
+def read_image_size(data):
+    try:
+        return Image.open(BytesIO(data)).size
+    except Exception:
+        return None
+
+
+def passes_dimension_check(width, height):
+    if width < MIN_IMAGE_SIZE or height < MIN_IMAGE_SIZE:
+        return False
+    aspect = max(width, height) / min(width, height)
+    return aspect <= PRESCREEN_MAX_ASPECT
+
+
+# ✅ 축소한 흑백 이미지의 에지 밀도 (글자가 있는 이미지일수록 높음)
+def edge_density(data):
+    img = Image.open(BytesIO(data))
+    img.draft("L", (PRESCREEN_SIZE, PRESCREEN_SIZE))  # JPEG은 디코딩 단계에서 바로 축소
+    img = img.convert("L")
+    img.thumbnail((PRESCREEN_SIZE, PRESCREEN_SIZE))
+    pixels = np.asarray(img, dtype=np.int16)
+    if pixels.shape[0] < 2 or pixels.shape[1] < 2:
+        return 0.0
+    dx = np.abs(np.diff(pixels, axis=1))[:-1, :]
+    dy = np.abs(np.diff(pixels, axis=0))[:, :-1]
+    edges = (dx > PRESCREEN_EDGE_THRESHOLD) | (dy > PRESCREEN_EDGE_THRESHOLD)
+    return float(edges.mean())
+
+
+# ✅ 이미지 다운로드 → (바이트 or None, 탈락 사유 or None)
+# - 사전 검사 시 앞부분만 Range 요청으로 받아 크기/비율부터 확인
+def download_image(url):
+    session = get_session()
+    if not PRESCREEN_ENABLED:
+        response = session.get(url, timeout=OCR_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        return response.content, None
+
+    headers = {"Range": f"bytes=0-{PRESCREEN_HEADER_BYTES - 1}"}
+    with session.get(url, headers=headers, timeout=OCR_DOWNLOAD_TIMEOUT, stream=True) as response:
+        response.raise_for_status()
+        chunks = response.iter_content(chunk_size=8192)
+        data = bytearray()
+        for chunk in chunks:
+            data += chunk
+            if len(data) >= PRESCREEN_HEADER_BYTES:
+                break
+
+        size = read_image_size(bytes(data))
+        if size is not None and not passes_dimension_check(*size):
+            return None, SKIP_DIMENSION
+
+        if response.status_code != 206:
+            # 서버가 Range를 무시한 경우 같은 연결에서 나머지를 이어서 받음
+            for chunk in chunks:
+                data += chunk
+            return bytes(data), None
+
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        if total.isdigit() and len(data) >= int(total):
+            return bytes(data), None
+
+    response = session.get(url, timeout=OCR_DOWNLOAD_TIMEOUT)
+    response.raise_for_status()
+    return response.content, None
+
+
+# 다운로드 단계 결과 (text=None 이면 OCR 필요 → data 를 프로세스 풀에 제출, keys: OCR 결과를 저장할 캐시 키)
+Download = namedtuple("Download", ["text", "skip_reason", "cache_hit", "data", "keys"])
+
+
+# ✅ 이미지 하나 다운로드 + 캐시 확인 + 사전 검사 (다운로드 스레드에서 실행, OCR 결과는 기다리지 않음) → Download
+# - 캐시는 URL 해시로 먼저 조회하고, 다운로드 후 이미지 바이트 해시로 한 번 더 조회
+# - 사전 검사에서 탈락한 이미지도 빈 텍스트로 저장해서 다음엔 다운로드부터 생략
+def _download_and_check(url):
+    cache = get_ocr_cache()
+    keys = [url_key(url)]
+    if cache is not None:
+        cached = cache.get(keys[0], OCR_LANG)
+        if cached is not None:
+            return Download(cached, None, True, None, keys)
+
+    data, skip_reason = download_image(url)
+    if data is not None and cache is not None and OCR_CACHE_CONTENT_HASH:
+        keys.append(content_key(data))
+        cached = cache.get(keys[1], OCR_LANG)
+        if cached is not None:
+            cache.put(keys[:1], cached, OCR_LANG)
+            return Download(cached, None, True, None, keys)
+
+    if skip_reason is None and PRESCREEN_ENABLED and edge_density(data) < PRESCREEN_MIN_EDGE_DENSITY:
+        skip_reason = SKIP_NO_TEXT
+    if skip_reason is not None:
+        if cache is not None:
+            cache.put(keys, "", OCR_LANG)
+        return Download("", skip_reason, False, None, keys)
+    return Download(None, None, False, data, keys)
+
+
+# ✅ 끝난 OCR 작업 결과를 통계/캐시에 반영
+def _record_ocr(keys, text, seconds):
+    if seconds:
+        with _lock:
+            _stats["ocr_count"] += 1
+            _stats["ocr_seconds"] += seconds
+    cache = get_ocr_cache()
+    if cache is not None:
+        cache.put(keys, text, OCR_LANG)
+
+
+def _average_ocr_seconds():
+    with _lock:
+        return _stats["ocr_seconds"] / _stats["ocr_count"] if _stats["ocr_count"] else 0.0
+
+
+# ✅ 누적 OCR 통계 (OCR 횟수, 생략 수, 절약 추정시간)
+def get_ocr_stats():
+    with _lock:
+        return dict(_stats)
+
+
+# ✅ OCR 결과를 끝나는 순서대로 (url, text) 로 내보냄
+# - 다운로드가 끝난 이미지는 바로 프로세스 풀에 OCR 제출 (다운로드 스레드는 OCR 을 기다리지 않고 다음 이미지로)
+# - 이미지당 시간 제한은 OCR 작업 안에서 Tesseract 실행 시간에만 적용 (풀 대기 시간은 포함하지 않음)
+# - 블로그 예산(blog_timeout)을 넘기면 아직 시작하지 않은 다운로드/OCR 작업을 취소
+# - OCR 작업 프로세스가 죽으면 그 이미지는 건너뛰고 풀을 새로 만듦 (이후 요청의 OCR 은 계속 동작)
+def iter_text_from_images(image_urls, blog_timeout=OCR_BLOG_TIMEOUT):
+    if not image_urls:
+        return
+    download_executor = _get_executors()[0]
+    downloads = {download_executor.submit(_download_and_check, url): url for url in image_urls}
+    ocr_jobs = {}  # OCR 풀 future → (url, 캐시 키, 제출한 풀)
+    pending = set(downloads)
+    deadline = time.monotonic() + blog_timeout
+    skipped = {SKIP_DIMENSION: 0, SKIP_NO_TEXT: 0}
+    cache_hits = 0
+
+    try:
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                print(f"[OCR] 블로그 OCR 시간 초과 ({blog_timeout}s) → 이미지 {len(image_urls)}개 중 {len(pending)}개 처리 중단")
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in downloads:
+                    url = downloads[future]
+                    try:
+                        result = future.result()
+                    except Exception:
+                        continue
+                    cache_hits += result.cache_hit
+                    if result.skip_reason is not None:
+                        skipped[result.skip_reason] += 1
+                    elif result.text is None:
+                        try:
+                            ocr_future, ocr_executor = _submit_ocr(result.data)
+                        except Exception as e:
+                            print(f"[OCR] OCR 작업 제출 실패 → 이미지 건너뜀: {url} ({e})")
+                            continue
+                        ocr_jobs[ocr_future] = (url, result.keys, ocr_executor)
+                        pending.add(ocr_future)
+                    elif result.text:
+                        yield url, result.text
+                else:
+                    url, keys, ocr_executor = ocr_jobs[future]
+                    try:
+                        text, seconds = future.result()
+                    except BrokenProcessPool:
+                        print(f"[OCR] OCR 작업 프로세스 비정상 종료 → 이미지 건너뜀: {url}")
+                        _reset_ocr_executor(ocr_executor)
+                        continue
+                    except Exception:  # Tesseract 시간 초과 등
+                        continue
+                    _record_ocr(keys, text, seconds)
+                    if text:
+                        yield url, text
+    finally:
+        # 실행 중인 OCR 은 취소할 수 없지만 작업 안의 시간 제한(OCR_IMAGE_TIMEOUT)으로 끝남
+        for future in [*downloads, *ocr_jobs]:
+            future.cancel()
+        _report_skipped(len(downloads), skipped)
+        if get_ocr_cache() is not None:
+            print(f"[OCR 캐시] 적중 {cache_hits} / 미스 {len(downloads) - cache_hits} (누적 {get_ocr_cache().stats()})")
+
+
+def _report_skipped(total, skipped):
+    count = sum(skipped.values())
+    if not count:
+        return
+    saved = count * _average_ocr_seconds()
+    with _lock:
+        _stats["skipped"] += count
+        _stats["saved_seconds"] += saved
+    print(
+        f"[OCR] 이미지 {total}개 중 {count}개 OCR 생략 "
+        f"(크기/비율 {skipped[SKIP_DIMENSION]}, 텍스트 없음 추정 {skipped[SKIP_NO_TEXT]}) "
+        f"→ 약 {saved:.1f}s 절약"
+    )
+
+
+# ✅ 이미지 목록 OCR (입력 순서대로 합친 문자열 반환)
+def extract_text_from_images(image_urls):
+    texts = dict(iter_text_from_images(image_urls))
+    return "\n".join(texts[url] for url in image_urls if url in texts)
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# ✅ 페이지 캐시 설정
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE", "1") == "1"
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", "cache/page_cache.sqlite3")
+PAGE_CACHE_MAX_AGE = float(os.getenv("PAGE_CACHE_MAX_AGE_HOURS", "24")) * 3600
+PAGE_CACHE_STALE_WHILE_REVALIDATE = os.getenv("PAGE_CACHE_STALE_WHILE_REVALIDATE", "1") == "1"
+PAGE_CACHE_STALE_TTL = float(os.getenv("PAGE_CACHE_STALE_TTL_HOURS", "168")) * 3600
+PAGE_CACHE_REVALIDATE_WORKERS = int(os.getenv("PAGE_CACHE_REVALIDATE_WORKERS", "2"))
+
+# 캐시 항목 상태
+FRESH = "fresh"      # 그대로 사용
+STALE = "stale"      # 사용하고 백그라운드에서 재검증
+EXPIRED = "expired"  # 다시 가져와야 함 (항목 없음 포함)
+
+CachedPage = namedtuple("CachedPage", ["key", "body", "images", "etag", "last_modified", "digest", "fetched_at"])
+
+
+def content_digest(body, images):
+    payload = json.dumps([body, images], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """
+    URL별 크롤링 결과 캐시 (SQLite)
+    - 키: normalize_url(url)
+    - 정제된 본문, 이미지 목록, 가져온 시각, ETag/Last-Modified, 본문 다이제스트 저장
+    - max_age 이내면 fresh, stale_while_revalidate 설정 시 stale_ttl 이내면 stale(재검증 필요), 그 외는 expired
+    """
+
+    def __init__(self, path=PAGE_CACHE_PATH, max_age=PAGE_CACHE_MAX_AGE,
+                 stale_while_revalidate=PAGE_CACHE_STALE_WHILE_REVALIDATE, stale_ttl=PAGE_CACHE_STALE_TTL):
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._executor = ThreadPoolExecutor(max_workers=PAGE_CACHE_REVALIDATE_WORKERS, thread_name_prefix="page-revalidate")
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS page_cache (
+                key TEXT PRIMARY KEY,
+                body TEXT NOT NULL,
+                images TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                digest TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT key, body, images, etag, last_modified, digest, fetched_at FROM page_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedPage(row[0], row[1], json.loads(row[2]), row[3], row[4], row[5], row[6])
+
+    def freshness(self, entry):
+        if entry is None:
+            return EXPIRED
+        age = time.time() - entry.fetched_at
+        if age <= self.max_age:
+            return FRESH
+        if self.stale_while_revalidate and age <= self.stale_ttl:
+            return STALE
+        return EXPIRED
+
+    # ✅ 저장 (다이제스트가 같으면 가져온 시각만 갱신)
+    def put(self, key, body, images, etag=None, last_modified=None):
+        digest = content_digest(body, images)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM page_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[0] == digest:
+                self._conn.execute(
+                    "UPDATE page_cache SET fetched_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified) WHERE key = ?",
+                    (now, etag, last_modified, key),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO page_cache VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, body, json.dumps(images, ensure_ascii=False), etag, last_modified, digest, now),
+                )
+            self._conn.commit()
+
+    # ✅ 변경 없음 확인 (304) → 가져온 시각만 갱신
+    def touch(self, key):
+        with self._lock:
+            self._conn.execute("UPDATE page_cache SET fetched_at = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+
+    # ✅ 백그라운드 재검증 (같은 키는 동시에 한 번만)
+    def revalidate_in_background(self, key, refresh):
+        with self._lock:
+            if key in self._revalidating:
+                return
+            self._revalidating.add(key)
+
+        def run():
+            try:
+                refresh()
+            except Exception as e:
+                print(f"[캐시] 재검증 실패: {key} ({e})")
+            finally:
+                with self._lock:
+                    self._revalidating.discard(key)
+
+        self._executor.submit(run)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 페이지 캐시 (비활성화 시 None)
+def get_page_cache():
+    global _cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = PageCache()
+        return _cache
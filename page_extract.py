@@ -0,0 +1,123 @@
+from collections import namedtuple
+from lxml import etree
+from lxml import html as lxml_html
+
+from text_cleaning import clean_text
+
+
+def _class_xpath(tag, class_name):
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# ✅ 본문 컨테이너 우선순위 (CSS 선택자, XPath) - 앞에서부터 찾음
+NAVER_BODY_SELECTORS = [
+    ("div.se-main-container", _class_xpath("div", "se-main-container")),
+    ("#postViewArea", "//*[@id='postViewArea']"),
+]
+GENERAL_BODY_SELECTORS = [
+    ("div.article-body", _class_xpath("div", "article-body")),
+    ("div.articleView", _class_xpath("div", "articleView")),
+    ("div#article-view-content-div", "//div[@id='article-view-content-div']"),
+    ("div.entry-content", _class_xpath("div", "entry-content")),
+    ("div#content", "//div[@id='content']"),
+    ("article", "//article"),
+    ("body", "//body"),
+]
+SKIP_TAGS = {"script", "style"}
+AD_IMAGE_DOMAINS = ["adimg", "doubleclick", "googlesyndication", "adsystem"]
+NO_BODY = "[본문 없음]"
+
+# 페이지 추출 결과 (text: 정제한 본문 or None, raw_length: 정제 전 길이, selector: 본문을 찾은 CSS 선택자)
+PageContent = namedtuple("PageContent", ["text", "images", "selector", "raw_length"])
+EMPTY_PAGE = PageContent(None, [], None, 0)
+
+
+def element_text(element):
+    """
+    BeautifulSoup get_text(strip=True)와 같은 방식으로 텍스트 추출
+    (script/style/주석 제외, 각 문자열을 strip 후 구분자 없이 이어붙임)
+    """
+    parts = []
+
+    def walk(el):
+        if not isinstance(el.tag, str) or el.tag in SKIP_TAGS:
+            return
+        if el.text and el.text.strip():
+            parts.append(el.text.strip())
+        for child in el:
+            walk(child)
+            if child.tail and child.tail.strip():
+                parts.append(child.tail.strip())
+
+    walk(element)
+    return "".join(parts)
+
+
+# ✅ 이미지 URL 필터링 (광고, base64, gif 제외)
+def filter_image_urls(srcs):
+    valid_images = []
+    for src in srcs:
+        if not src:
+            continue
+        if any(domain in src for domain in AD_IMAGE_DOMAINS):
+            continue
+        if "base64" in src or src.endswith(".gif"):
+            continue
+        valid_images.append(src)
+    return valid_images
+
+
+# ✅ 이미지 URL 필터링 (광고, http(s) 가 아닌 주소 제외) - extract_content 용
+def filter_http_image_urls(srcs):
+    valid_images = []
+    for src in srcs:
+        if not src:
+            continue
+        if any(domain in src for domain in AD_IMAGE_DOMAINS):
+            continue
+        if not src.startswith("http"):
+            continue
+        valid_images.append(src)
+    return valid_images
+
+
+def extract_page(page_html, selectors, require_text=True, image_filter=filter_image_urls):
+    """
+    페이지 HTML 한 번만 파싱해서 본문과 이미지를 같은 트리에서 추출 → PageContent
+    - selectors: (CSS 선택자, XPath) 목록, 앞에서부터 본문 컨테이너를 찾음
+    - require_text=True: 텍스트가 비어 있는 컨테이너는 건너뛰고 다음 선택자 시도
+    - image_filter: 이미지 src 목록 → 남길 URL 목록
+    - 본문 컨테이너를 못 찾으면 text=None (이미지는 그대로 돌려줌)
+    """
+    if not page_html:
+        return EMPTY_PAGE
+    try:
+        tree = lxml_html.fromstring(page_html)
+    except (etree.ParserError, ValueError):
+        return EMPTY_PAGE
+
+    images = image_filter(tree.xpath("//img/@src"))
+    for css, xpath in selectors:
+        found = tree.xpath(xpath)
+        if not found:
+            continue
+        raw = element_text(found[0])
+        if require_text and not raw:
+            continue
+        return PageContent(clean_text(raw), images, css, len(raw))
+    return PageContent(None, images, None, 0)
+
+
+# ✅ 페이지 전체 이미지만 추출 (본문 없이)
+def extract_page_images(page_html, image_filter=filter_image_urls):
+    return extract_page(page_html, [], image_filter=image_filter).images
+
+
+# ✅ 네이버 블로그 (mainFrame 문서 또는 PostView 문서)
+def extract_naver_page(page_html, image_filter=filter_image_urls):
+    return extract_page(page_html, NAVER_BODY_SELECTORS, require_text=False, image_filter=image_filter)
+
+
+# ✅ 일반 페이지 (기사/블로그 본문 선택자 → 마지막에 body 전체)
+def extract_general_page(page_html, image_filter=filter_image_urls):
+    return extract_page(page_html, GENERAL_BODY_SELECTORS, image_filter=image_filter)
@@ -0,0 +1,93 @@
+import os
+import time
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+# ✅ 대기 설정 (최대 대기시간, 초 단위)
+WAIT_TIMEOUT = float(os.getenv("WAIT_TIMEOUT", "10"))
+WAIT_POLL_INTERVAL = float(os.getenv("WAIT_POLL_INTERVAL", "0.2"))
+SCROLL_SETTLE_TIMEOUT = float(os.getenv("SCROLL_SETTLE_TIMEOUT", "1.5"))
+STABLE_COUNT_DURATION = float(os.getenv("STABLE_COUNT_DURATION", "0.6"))
+SCROLL_MAX_ITERATIONS = int(os.getenv("SCROLL_MAX_ITERATIONS", "15"))  # 무한 스크롤 페이지에서 최대 스크롤 횟수
+
+
+# ✅ 단계별 소요시간 로그
+@contextmanager
+def timed_step(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        print(f"[⏱] {name}: {time.perf_counter() - start:.2f}s")
+
+
+def _wait(driver, timeout):
+    return WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_INTERVAL)
+
+
+# ✅ document.readyState == complete 까지 대기
+def wait_for_document_ready(driver, timeout=WAIT_TIMEOUT):
+    try:
+        _wait(driver, timeout).until(
+            lambda d: d.execute_script("return document.readyState") == "complete"
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+# ✅ iframe이 붙을 때까지 대기 후 전환
+def wait_for_frame(driver, frame_name="mainFrame", timeout=WAIT_TIMEOUT):
+    try:
+        _wait(driver, timeout).until(EC.frame_to_be_available_and_switch_to_it(frame_name))
+        return True
+    except TimeoutException:
+        return False
+
+
+# ✅ 셀렉터 중 하나라도 나타날 때까지 대기 (나타난 셀렉터 반환, 없으면 None)
+def wait_for_any_selector(driver, selectors, timeout=WAIT_TIMEOUT):
+    def _present(d):
+        for sel in selectors:
+            if d.find_elements(By.CSS_SELECTOR, sel):
+                return sel
+        return False
+
+    try:
+        return _wait(driver, timeout).until(_present)
+    except TimeoutException:
+        return None
+
+
+# ✅ 요소 개수가 stable_for초 동안 변하지 않을 때까지 대기 (마지막 개수 반환)
+# - 0개인 경우는 문서 로딩이 끝난 뒤에만 안정된 것으로 판단 (결과 없는 페이지에서 최대 대기 방지)
+def wait_for_stable_count(driver, selector, timeout=WAIT_TIMEOUT, stable_for=STABLE_COUNT_DURATION):
+    deadline = time.monotonic() + timeout
+    last_count = -1
+    stable_since = time.monotonic()
+    while True:
+        count = len(driver.find_elements(By.CSS_SELECTOR, selector))
+        now = time.monotonic()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif now - stable_since >= stable_for and (
+            count > 0 or driver.execute_script("return document.readyState") == "complete"
+        ):
+            return count
+        if now >= deadline:
+            return count
+        time.sleep(WAIT_POLL_INTERVAL)
+
+
+# ✅ 스크롤 후 페이지 높이가 늘어날 때까지 대기 (새 높이 반환, 변화 없으면 이전 높이)
+def wait_for_height_change(driver, last_height, timeout=SCROLL_SETTLE_TIMEOUT):
+    try:
+        return _wait(driver, timeout).until(
+            lambda d: (h := d.execute_script("return document.body.scrollHeight")) != last_height and h
+        )
+    except TimeoutException:
+        return last_height
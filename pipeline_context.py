@@ -0,0 +1,62 @@
+import time
+import threading
+from contextlib import contextmanager
+
+
+class PipelineContext:
+    """
+    요청 하나의 GPT 파이프라인 상태 (요청마다 새로 만들고 요청 간에 공유하지 않음)
+    - accumulated_result: sequential 모드에서 블로그마다 갱신하는 누적 결과
+    - token_log: 블로그 본문 원래 토큰 수 / 실제 전송 토큰 수
+    - counters: GPT 호출/실패/생략/유사 중복 블로그 수, timings: 단계별 소요시간(초)
+    - cluster_sizes: GPT 단계에 넘긴 블로그별 유사 중복 묶음 크기 (중복으로 빠진 블로그는 0)
+    - progress(stage, done, total): 진행 상황 콜백 (없으면 무시)
+    - on_partial(rows): 블로그를 처리할 때마다 지금까지의 (잠정) 장소 목록을 받는 콜백 (없으면 무시)
+    """
+
+    def __init__(self, movie_title, mode, progress=None, on_partial=None):
+        self.movie_title = movie_title
+        self.mode = mode
+        self.progress = progress
+        self.on_partial = on_partial
+        self.accumulated_result = ""
+        self.token_log = {"original": 0, "sent": 0}
+        self.counters = {"gpt_calls": 0, "gpt_failures": 0, "skipped_blogs": 0, "duplicate_blogs": 0}
+        self.cluster_sizes = []
+        self.timings = {}
+        self._lock = threading.Lock()  # map_reduce 워커 스레드에서 같이 갱신
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_tokens(self, original, sent):
+        with self._lock:
+            self.token_log["original"] += original
+            self.token_log["sent"] += sent
+
+    def report(self, stage, done, total):
+        if self.progress:
+            self.progress(stage, done, total)
+
+    def publish(self, rows):
+        if self.on_partial:
+            self.on_partial(rows)
+
+    @contextmanager
+    def timed(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[stage] = round(time.perf_counter() - start, 3)
+
+    def summary(self):
+        return {
+            "movie": self.movie_title,
+            "mode": self.mode,
+            "tokens": dict(self.token_log),
+            "counters": dict(self.counters),
+            "clusters": [size for size in self.cluster_sizes if size > 1],
+            "timings": dict(self.timings),
+        }
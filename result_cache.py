@@ -0,0 +1,121 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+# ✅ 영화 단위 결과 캐시 설정
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE", "1") == "1"
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "cache/result_cache.sqlite3")
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL_HOURS", "24")) * 3600
+RESULT_CACHE_EMPTY_TTL = float(os.getenv("RESULT_CACHE_EMPTY_TTL_MINUTES", "10")) * 60
+
+# 크롤링/프롬프트/필터 규칙이 바뀌어 결과가 달라지면 올릴 것 (이전 버전 캐시는 자동으로 무시됨)
+PIPELINE_VERSION = "5"
+
+
+def normalize_title(title):
+    return re.sub(r"\s+", " ", title).strip().lower()
+
+
+def result_key(movie_id, title):
+    return f"{movie_id}|{normalize_title(title)}|{PIPELINE_VERSION}"
+
+
+class ResultCache:
+    """
+    (영화 id, 정규화한 제목, 파이프라인 버전) 단위 결과 저장소 + 요청 합치기
+    - TTL 이내의 결과는 파이프라인을 돌리지 않고 바로 반환 (빈 결과는 짧은 TTL)
+    - 같은 키로 이미 계산 중이면 새로 돌리지 않고 그 결과를 같이 기다림
+    """
+
+    def __init__(self, path=RESULT_CACHE_PATH, ttl=RESULT_CACHE_TTL, empty_ttl=RESULT_CACHE_EMPTY_TTL):
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS result_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT result, created_at FROM result_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        result = json.loads(row[0])
+        ttl = self.ttl if result else self.empty_ttl
+        if time.time() - row[1] > ttl:
+            return None
+        return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO result_cache VALUES (?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), time.time()),
+            )
+            self._conn.commit()
+
+    # ✅ 캐시 조회 → 없으면 계산 (동시에 들어온 같은 키 요청은 한 번만 계산)
+    def get_or_compute(self, key, compute, force_refresh=False):
+        if not force_refresh:
+            cached = self.get(key)
+            if cached is not None:
+                print(f"[결과 캐시] 적중: {key}")
+                return cached
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not owner:
+            print(f"[결과 캐시] 진행 중인 요청에 합류: {key}")
+            return future.result()
+
+        try:
+            # 첫 조회 이후 다른 요청이 계산을 끝내고 저장했을 수 있으므로 한 번 더 확인
+            result = None if force_refresh else self.get(key)
+            if result is not None:
+                print(f"[결과 캐시] 적중 (직전에 끝난 요청): {key}")
+            else:
+                result = compute()
+                self.put(key, result)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 결과 캐시 (비활성화 시 None)
+def get_result_cache():
+    global _cache
+    if not RESULT_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
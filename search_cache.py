@@ -0,0 +1,77 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+
+from result_cache import normalize_title
+
+# ✅ 검색 결과(URL 목록) 캐시 설정
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE", "1") == "1"
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "cache/search_cache.sqlite3")
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL_HOURS", "6")) * 3600
+
+
+def search_key(movie_title, suffixes):
+    return f"{normalize_title(movie_title)}|{'/'.join(sorted(suffixes))}"
+
+
+class SearchCache:
+    """
+    (정규화한 영화 제목, 검색어 접미사 집합) 단위 블로그 URL 목록 캐시
+    - limit: 저장할 때 요청한 최대 개수 → 더 많이 요청하면 목록이 잘렸을 수 있으므로 미스로 처리
+    """
+
+    def __init__(self, path=SEARCH_CACHE_PATH, ttl=SEARCH_CACHE_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS search_cache (
+                key TEXT PRIMARY KEY,
+                urls TEXT NOT NULL,
+                max_results INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key, max_results):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT urls, max_results, created_at FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or time.time() - row[2] > self.ttl:
+            return None
+        urls = json.loads(row[0])
+        # 적게 요청해서 저장한 목록은 더 많이 요청하면 부족할 수 있음 (검색 결과가 원래 적었던 경우는 제외)
+        if max_results > row[1] and len(urls) >= row[1]:
+            return None
+        return urls[:max_results]
+
+    def put(self, key, urls, max_results):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                (key, json.dumps(urls, ensure_ascii=False), max_results, time.time()),
+            )
+            self._conn.commit()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+# ✅ 프로세스 공용 검색 결과 캐시 (비활성화 시 None)
+def get_search_cache():
+    global _cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = SearchCache()
+        return _cache
@@ -0,0 +1,37 @@
+"""
+녹화된 HTML을 보여주는 Selenium WebDriver 대역 (page_wait / 추출 함수가 쓰는 메서드만 구현)
+- frame_html 을 주면 네이버 블로그처럼 mainFrame 전환 시 그 문서를 보여줌
+"""
+from lxml import html as lxml_html
+
+from page_extract import NAVER_BODY_SELECTORS, GENERAL_BODY_SELECTORS
+
+SELECTOR_XPATHS = dict(NAVER_BODY_SELECTORS + GENERAL_BODY_SELECTORS)
+
+
+class FakeDriver:
+    def __init__(self, main_html, frame_html=None):
+        self.main_html = main_html
+        self.frame_html = frame_html
+        self.in_frame = False
+        self.switch_to = self
+
+    def get(self, url):
+        self.in_frame = False
+
+    def frame(self, reference):
+        assert reference == "mainFrame" and self.frame_html is not None
+        self.in_frame = True
+
+    def default_content(self):
+        self.in_frame = False
+
+    @property
+    def page_source(self):
+        return self.frame_html if self.in_frame else self.main_html
+
+    def find_elements(self, by, selector):
+        return lxml_html.fromstring(self.page_source).xpath(SELECTOR_XPATHS[selector])
+
+    def execute_script(self, script, *args):
+        return "complete" if "readyState" in script else None
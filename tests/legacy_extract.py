@@ -0,0 +1,101 @@
+"""
+비교 기준이 되는 기존 구현 (baseline 의 extract_movie.py / extract_content.py 에 있던 코드 그대로)
+- clean_text: 정제 정규식 연쇄
+- extract_image_urls / extract_naver_blog_body / extract_general_body: BeautifulSoup get_text(strip=True) 추출
+- content_extract_image_urls: extract_content.py 의 이미지 필터 (http 주소만, gif/base64 는 그대로)
+- time.sleep 은 테스트에서 바꿔 끼울 수 있도록 모듈 time 을 그대로 씀
+"""
+import re
+import time
+
+from bs4 import BeautifulSoup
+
+
+def clean_text(text):
+    text = re.sub(r"\s+", " ", text)
+    text = re.sub(r"\u200b", "", text)
+    text = re.sub(r"\b\d{2,4}[-.\s]?\d{3,4}[-.\s]?\d{4}\b", "", text)
+    text = re.sub(
+        r"[\U0001F600-\U0001F64F"  # emoticons
+        r"\U0001F300-\U0001F5FF"
+        r"\U0001F680-\U0001F6FF"
+        r"\U0001F1E0-\U0001F1FF"
+        r"\u2600-\u26FF"
+        r"\u2700-\u27BF]+", "", text, flags=re.UNICODE)
+    patterns_to_remove = [
+        r"이\s?글은\s?.{0,20}제공받았습니다",
+        r"내\s?돈\s?내\s?산",
+        r"블로그에서\s?더\s?보기",
+        r"인스타그램\s?@[\w]+",
+        r"좋아요\s?[~!꾹♥❤❣️]*",
+        r"링크[:：]?\s?https?://[^\s]+",
+        r"클릭해서\s?확인하세요",
+        r"더\s?많은\s?사진은\s?블로그에서",
+        r"광고\s?포함",
+    ]
+    for pattern in patterns_to_remove:
+        text = re.sub(pattern, "", text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def extract_image_urls(driver):
+    soup = BeautifulSoup(driver.page_source, "html.parser")
+    img_tags = soup.find_all("img")
+    valid_images = []
+    for img in img_tags:
+        src = img.get("src")
+        if not src:
+            continue
+        if any(domain in src for domain in ["adimg", "doubleclick", "googlesyndication", "adsystem"]):
+            continue
+        if "base64" in src or src.endswith(".gif"):
+            continue
+        valid_images.append(src)
+    return valid_images
+
+
+def extract_naver_blog_body(driver, url):
+    driver.get(url)
+    time.sleep(2)
+    try:
+        driver.switch_to.frame("mainFrame")
+        time.sleep(1)
+    except:
+        return "[ERROR] iframe 접근 실패", []
+    soup = BeautifulSoup(driver.page_source, "html.parser")
+    content = soup.select_one("div.se-main-container") or soup.select_one("#postViewArea")
+    text = content.get_text(strip=True) if content else "[본문 없음]"
+    return clean_text(text), extract_image_urls(driver)
+
+
+def extract_general_body(driver, url):
+    driver.get(url)
+    time.sleep(2)
+    soup = BeautifulSoup(driver.page_source, "html.parser")
+    selectors = [
+        "div.article-body", "div.articleView", "div#article-view-content-div",
+        "div.entry-content", "div#content", "article", "body"
+    ]
+    for sel in selectors:
+        content = soup.select_one(sel)
+        if content and content.get_text(strip=True):
+            return clean_text(content.get_text(strip=True)), extract_image_urls(driver)
+    return "[본문 없음]", []
+
+
+def content_extract_image_urls(driver):
+    soup = BeautifulSoup(driver.page_source, "html.parser")
+    img_tags = soup.find_all("img")
+
+    valid_images = []
+    for img in img_tags:
+        src = img.get("src")
+        if not src:
+            continue
+        # 광고 이미지 제외 규칙
+        if any(domain in src for domain in ["adimg", "doubleclick", "googlesyndication", "adsystem"]):
+            continue
+        if not src.startswith("http"):
+            continue
+        valid_images.append(src)
+    return valid_images
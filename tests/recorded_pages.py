@@ -0,0 +1,34 @@
+"""
+비교 테스트에 쓰는 녹화 페이지 목록 (benchmarks/fixtures + tests/fixtures)
+"""
+import os
+import json
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES = os.path.join(REPO_DIR, "benchmarks", "fixtures")
+TEST_FIXTURES = os.path.join(REPO_DIR, "tests", "fixtures")
+MAIN_FRAME_PAGE = os.path.join(TEST_FIXTURES, "naver_blog_main.html")
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _manifest_pages(is_naver):
+    with open(os.path.join(FIXTURES, "offline", "manifest.json"), "r", encoding="utf-8") as f:
+        pages = json.load(f)["pages"]
+    return [os.path.join(FIXTURES, "offline", path) for url, path in pages.items() if ("blog.naver.com" in url) == is_naver]
+
+
+# ✅ 네이버 PostView 문서 (mainFrame 안 문서)
+def naver_postviews():
+    return [
+        os.path.join(FIXTURES, "pages", "naver_postview.html"),
+        os.path.join(TEST_FIXTURES, "naver_postview_edge.html"),
+    ] + _manifest_pages(is_naver=True)
+
+
+# ✅ 일반 페이지 (기사/티스토리)
+def general_pages():
+    return [os.path.join(FIXTURES, "pages", "news_article.html")] + _manifest_pages(is_naver=False)
@@ -0,0 +1,55 @@
+"""
+로컬 크롤링 서버 NDJSON 스트림에서 깨진 줄이 있어도 나머지 블로그는 계속 받는지 확인
+"""
+import json
+
+import requests
+
+import analyze_with_gpt
+
+
+class FakeStreamResponse:
+    def __init__(self, lines, error=None):
+        self.lines = lines
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self.lines
+        if self.error is not None:
+            raise self.error
+
+
+def _blog(i):
+    return {"url": f"https://blog.naver.com/a/{i}", "본문": f"본문 {i}"}
+
+
+def _stream(monkeypatch, lines, error=None):
+    monkeypatch.setenv("NGROK_URL", "http://crawler.local")
+    monkeypatch.setattr(analyze_with_gpt.requests, "post", lambda *args, **kwargs: FakeStreamResponse(lines, error))
+    return list(analyze_with_gpt.iter_blogs_from_local_crawler("기생충"))
+
+
+def test_malformed_lines_are_skipped(monkeypatch):
+    lines = [
+        json.dumps(_blog(1), ensure_ascii=False),
+        '{"url": "https://blog.naver.com/a/2", "본문": "잘린',
+        "",
+        "null",
+        json.dumps(_blog(3), ensure_ascii=False),
+    ]
+    assert _stream(monkeypatch, lines) == [_blog(1), _blog(3)]
+
+
+def test_connection_dropped_mid_line_keeps_received_blogs(monkeypatch):
+    lines = [json.dumps(_blog(1), ensure_ascii=False), '{"url": "https://blog.naver.com/a/2", "본']
+    error = requests.exceptions.ChunkedEncodingError("connection broken")
+    assert _stream(monkeypatch, lines, error) == [_blog(1)]
@@ -0,0 +1,43 @@
+"""
+extract_content 의 본문/이미지 추출이 기존 구현(BeautifulSoup get_text(strip=True) + http 이미지 필터)과 같은지 비교
+- extract_content 는 extract_movie 와 같은 page_extract 추출 계층을 쓰고 이미지 필터만 다름
+"""
+import os
+
+import pytest
+
+import extract_content
+import legacy_extract
+from fake_driver import FakeDriver
+from recorded_pages import MAIN_FRAME_PAGE, general_pages, naver_postviews, read
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(legacy_extract.time, "sleep", lambda seconds: None)
+
+
+@pytest.mark.parametrize("postview_path", naver_postviews(), ids=os.path.basename)
+def test_naver_blog_body_matches_legacy(postview_path):
+    url = "https://blog.naver.com/moviefan"
+    main_html, postview_html = read(MAIN_FRAME_PAGE), read(postview_path)
+    legacy_driver = FakeDriver(main_html, postview_html)
+    text, _ = legacy_extract.extract_naver_blog_body(legacy_driver, url)
+    expected = (text, legacy_extract.content_extract_image_urls(legacy_driver))
+    assert extract_content.extract_body_text(FakeDriver(main_html, postview_html), url) == expected
+
+
+@pytest.mark.parametrize("page_path", general_pages(), ids=os.path.basename)
+def test_general_body_matches_legacy(page_path):
+    url = "https://www.cine-news.co.kr/article/1"
+    page_html = read(page_path)
+    legacy_driver = FakeDriver(page_html)
+    text, _ = legacy_extract.extract_general_body(legacy_driver, url)
+    expected = (text, [] if text == "[본문 없음]" else legacy_extract.content_extract_image_urls(legacy_driver))
+    assert extract_content.extract_body_text(FakeDriver(page_html), url) == expected
+
+
+def test_extract_image_urls_matches_legacy():
+    page_html = read(os.path.join(os.path.dirname(MAIN_FRAME_PAGE), "naver_postview_edge.html"))
+    driver = FakeDriver(page_html)
+    assert extract_content.extract_image_urls(driver) == legacy_extract.content_extract_image_urls(driver)
@@ -0,0 +1,75 @@
+"""
+작업 큐 재시작/종료 처리
+- 중단된 서버가 남긴 running 작업은 재시작이 stale 시간 안에 끝나도 결국 실패 처리
+- 실행 중인 작업은 heartbeat 로 갱신되어 정리 대상이 아님
+- 종료 시 시작 전 작업은 queued 로 남고 실행 중인 작업은 실패 처리
+"""
+import time
+import threading
+
+import jobs
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def _queue(tmp_path, runner, **kwargs):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite3"))
+    options = {"max_concurrency": 1, "heartbeat_seconds": 0.05, "stale_seconds": 0.3}
+    options.update(kwargs)
+    return jobs.JobQueue(runner, store=store, **options)
+
+
+def test_running_job_of_crashed_server_is_failed_after_quick_restart(tmp_path):
+    job_queue = _queue(tmp_path, lambda request, report: {})
+    job_id = job_queue.store.create({"title": "알파"})
+    assert job_queue.store.claim(job_id, jobs.QUEUED, jobs.RUNNING)  # 이전 서버가 실행하다 죽은 작업
+
+    job_queue.start()  # stale 시간 안에 재시작 → 시작 시점에는 아직 실패 처리 안 됨
+    assert job_queue.store.get(job_id)["status"] == jobs.RUNNING
+    assert _wait_for(lambda: job_queue.store.get(job_id)["status"] == jobs.FAILED)
+    job_queue.shutdown()
+
+
+def test_heartbeat_keeps_long_running_job_alive(tmp_path):
+    release = threading.Event()
+    job_queue = _queue(tmp_path, lambda request, report: release.wait(5) and {"ok": True})
+    job_queue.start()
+    job_id = job_queue.submit({"title": "베타"})
+
+    time.sleep(0.8)  # stale_seconds 보다 오래 실행
+    assert job_queue.store.get(job_id)["status"] == jobs.RUNNING
+    release.set()
+    assert _wait_for(lambda: job_queue.store.get(job_id)["status"] == jobs.DONE)
+    job_queue.shutdown()
+
+
+def test_shutdown_keeps_queued_jobs_and_fails_running_ones(tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def runner(request, report):
+        started.set()
+        release.wait(5)
+        return {}
+
+    job_queue = _queue(tmp_path, runner)
+    job_queue.start()
+    running_id = job_queue.submit({"title": "감마"})
+    assert started.wait(5)
+    queued_id = job_queue.submit({"title": "델타"})
+
+    job_queue.shutdown()
+    assert job_queue.store.get(running_id)["status"] == jobs.FAILED
+    assert job_queue.store.get(queued_id)["status"] == jobs.QUEUED
+    release.set()
+
+    restarted = _queue(tmp_path, lambda request, report: {"ok": True})
+    restarted.start()
+    assert _wait_for(lambda: restarted.store.get(queued_id)["status"] == jobs.DONE)
+    restarted.shutdown()
@@ -0,0 +1,72 @@
+"""
+네이버 블로그 HTTP 경로(PostView 직접 요청)가 녹화된 페이지에서
+기존 구현(mainFrame 전환 + BeautifulSoup get_text(strip=True))과 같은 본문/이미지를 돌려주는지 비교
+- HTTP 경로가 None(Selenium 대체)을 돌려주는 페이지는 현재 Selenium 경로 결과를 기존 구현과 비교
+"""
+import os
+import asyncio
+
+import httpx
+import pytest
+
+import naver_http
+import extract_movie
+import legacy_extract
+from fake_driver import FakeDriver
+from recorded_pages import MAIN_FRAME_PAGE, naver_postviews, read
+
+@pytest.fixture
+def serve(monkeypatch):
+    """naver_http 공용 클라이언트를 녹화 페이지 응답으로 교체 (경로별 HTML 지정)"""
+
+    def install(routes):
+        def handler(request):
+            body = routes.get(request.url.path)
+            if body is None:
+                return httpx.Response(404)
+            return httpx.Response(200, text=body, headers={"ETag": '"fixture"'})
+
+        client = httpx.Client(transport=httpx.MockTransport(handler), headers=naver_http.HEADERS, follow_redirects=True)
+        monkeypatch.setattr(naver_http, "_client", client)
+
+    return install
+
+
+@pytest.mark.parametrize("postview_path", naver_postviews(), ids=os.path.basename)
+@pytest.mark.parametrize("url", [
+    "https://blog.naver.com/moviefan/223456789012",  # PostView 주소로 바로 변환되는 형식
+    "https://blog.naver.com/moviefan",  # 메인 페이지의 mainFrame iframe 을 따라가야 하는 형식
+])
+def test_http_path_matches_legacy_extraction(serve, monkeypatch, url, postview_path):
+    postview_html = read(postview_path)
+    main_html = read(MAIN_FRAME_PAGE)
+    serve({"/PostView.naver": postview_html, "/moviefan": main_html})
+    monkeypatch.setattr(legacy_extract.time, "sleep", lambda seconds: None)
+
+    document = naver_http.fetch_postview(url)
+    assert document.html == postview_html
+
+    expected = legacy_extract.extract_naver_blog_body(FakeDriver(main_html, postview_html), url)
+    result = extract_movie.extract_naver_blog_body_http(url, document)
+    if result is None:
+        # 본문 컨테이너가 비어 있으면 HTTP 경로는 Selenium 대체를 요청함 → 대체 경로 결과도 기존과 같아야 함
+        result = extract_movie.extract_naver_blog_body(FakeDriver(main_html, postview_html), url)
+    assert result == expected
+
+
+def test_unparseable_main_page_fails_only_that_blog(serve):
+    serve({"/moviefan": "   "})  # 공백 본문 → lxml ParserError
+    assert naver_http.fetch_postview("https://blog.naver.com/moviefan") == naver_http.FAILED_DOCUMENT
+
+
+def test_fetch_postviews_isolates_unexpected_errors(monkeypatch):
+    ok = naver_http.PostViewDocument("<html></html>", None, None, False)
+
+    async def fake_fetch(client, url, etag=None, last_modified=None):
+        if url.endswith("broken"):
+            raise RuntimeError("boom")
+        return ok
+
+    monkeypatch.setattr(naver_http, "fetch_postview_async", fake_fetch)
+    targets = [("https://blog.naver.com/a/1", None, None), ("https://blog.naver.com/broken", None, None)]
+    assert asyncio.run(naver_http.fetch_postviews(targets)) == [ok, naver_http.FAILED_DOCUMENT]
@@ -0,0 +1,38 @@
+"""
+OCR 작업 프로세스가 비정상 종료해도 해당 이미지만 건너뛰고, 이후 요청은 새 프로세스 풀로 계속 OCR 되는지 확인
+"""
+import os
+
+import pytest
+
+import ocr_stage
+
+
+# 프로세스 풀(spawn)에서 실행되므로 모듈 최상위 함수여야 함
+def fake_ocr(data, lang, tesseract_cmd, timeout):
+    if data == b"crash":
+        os._exit(1)  # 메모리 부족/세그폴트로 작업 프로세스가 죽은 상황
+    return data.decode(), 0.1
+
+
+@pytest.fixture(autouse=True)
+def fake_pipeline(monkeypatch):
+    monkeypatch.setattr(ocr_stage, "ocr_image_bytes", fake_ocr)
+    monkeypatch.setattr(ocr_stage, "OCR_PROCESSES", 1)
+    monkeypatch.setattr(ocr_stage, "_ocr_executor", None)
+    monkeypatch.setattr(ocr_stage, "_record_ocr", lambda keys, text, seconds: None)
+    monkeypatch.setattr(
+        ocr_stage, "_download_and_check",
+        lambda url: ocr_stage.Download(None, None, False, url.encode(), [url]),
+    )
+    yield
+    if ocr_stage._ocr_executor is not None:
+        ocr_stage._ocr_executor.shutdown(cancel_futures=True)
+
+
+def test_dead_worker_skips_image_and_pool_is_recreated():
+    assert ocr_stage.extract_text_from_images(["crash"]) == ""
+    assert ocr_stage._ocr_executor is None  # 망가진 풀은 버림
+
+    assert ocr_stage.extract_text_from_images(["첫번째", "두번째"]) == "첫번째\n두번째"
+    assert ocr_stage._ocr_executor is not None
@@ -0,0 +1,71 @@
+"""
+동시에 실행한 run_pipeline 호출끼리 상태(누적 결과/카운터/언급 수)가 섞이지 않는지 확인
+- GPT 호출은 스텁: 마지막 user 메시지(누적 결과 + 블로그 본문)에 있는 LOC-* 태그를 장소로 돌려줌
+"""
+import re
+import json
+import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+import ner_gate
+import gpt_client
+import token_budget
+import analyze_with_gpt
+
+TAG = re.compile(r"LOC-[a-z]+-\d+")
+MOVIES = {"alpha": "알파", "beta": "베타", "gamma": "감마"}
+BLOGS_PER_MOVIE = 4
+
+
+def fake_chat_completion(**kwargs):
+    time.sleep(random.uniform(0, 0.02))  # 요청끼리 교차 실행되도록
+    text = kwargs["messages"][-1]["content"]
+    fields = kwargs["response_format"]["json_schema"]["schema"]["properties"]["locations"]["items"]["required"]
+    locations = []
+    for tag in sorted(set(TAG.findall(text))):
+        location = {
+            "name": tag, "description": "", "address": f"서울 중구 {tag}길 1", "country": "대한민국",
+            "mentionCount": 1, "keywords": [], "extraInfo": [], "durationHours": 1.0,
+        }
+        locations.append({field: location[field] for field in fields})
+    content = json.dumps({"locations": locations}, ensure_ascii=False)
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture(autouse=True)
+def stub_llm(monkeypatch):
+    monkeypatch.setattr(gpt_client, "chat_completion", fake_chat_completion)
+    monkeypatch.setattr(analyze_with_gpt, "chat_completion", fake_chat_completion)
+    monkeypatch.setattr(analyze_with_gpt, "GPT_STRUCTURED_OUTPUT", True)
+    monkeypatch.setattr(ner_gate, "NER_GATE_MODE", "off")
+    monkeypatch.setattr(token_budget, "_encoding", token_budget._UNAVAILABLE)  # BPE 다운로드 없이 글자 수로 추정
+
+
+def blogs_for(key):
+    return [
+        {"url": f"https://blog.naver.com/{key}/{j}", "본문": f"{MOVIES[key]} {j}번째 후기. 촬영 장소는 LOC-{key}-{j} 입니다."}
+        for j in range(1, BLOGS_PER_MOVIE + 1)
+    ]
+
+
+@pytest.mark.parametrize("mode", ["sequential", "map_reduce"])
+def test_concurrent_pipelines_do_not_share_state(mode):
+    def run(key):
+        ctx = analyze_with_gpt.PipelineContext(MOVIES[key], mode)
+        rows = analyze_with_gpt.run_pipeline(blogs_for(key), MOVIES[key], mode=mode, ctx=ctx)
+        return key, ctx, rows
+
+    jobs = list(MOVIES) * 3
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        results = list(executor.map(run, jobs))
+
+    for key, ctx, rows in results:
+        expected = {f"LOC-{key}-{j}" for j in range(1, BLOGS_PER_MOVIE + 1)}
+        assert {row["장소명"] for row in rows} == expected
+        assert ctx.counters["gpt_calls"] == BLOGS_PER_MOVIE
+        assert ctx.counters["gpt_failures"] == 0
+        assert set(TAG.findall(ctx.accumulated_result)) <= expected
@@ -0,0 +1,43 @@
+"""
+text_cleaning.clean_text 가 기존 구현(extract_movie.clean_text 의 re.sub 연쇄)과 같은 결과를 내는지 비교
+- 저장된 본문 코퍼스(benchmarks/fixtures/blog_bodies.jsonl) + 규칙 조각을 무작위로 이어 붙인 문자열
+"""
+import os
+import json
+import random
+
+import pytest
+
+from text_cleaning import clean_text
+from legacy_extract import clean_text as legacy_clean_text
+
+CORPUS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "fixtures", "blog_bodies.jsonl")
+
+
+def _corpus():
+    with open(CORPUS, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# 규칙끼리 겹치거나, 삭제 후 앞뒤가 이어져 새 문구가 생기는 경우를 만들기 위한 조각
+FRAGMENTS = [
+    "이", "글은", "업체로부터", "제공받았습니다", "내", "돈", "산", "블로그에서", "더", "보기", "많은", "사진은",
+    "인스타그램", "@movie_fan", "좋아요", "~", "!", "꾹", "♥", "❤", "❣️", "링크", ":", "：",
+    "https://blog.naver.com/a", "클릭해서", "확인하세요", "광고", "포함", "010", "1234", "5678", "02-123-4567",
+    "\u200b", "\U0001F600", "\U0001F3AC", "\u2600", "Seoul", "촬영지", " ", "  ", "\n", "\t", ".", "-",
+]
+
+
+def _fuzz_cases(count=3000, seed=20240611):
+    rng = random.Random(seed)
+    return ["".join(rng.choice(FRAGMENTS) + rng.choice(["", "", " "]) for _ in range(rng.randint(1, 14))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("entry", _corpus(), ids=lambda entry: entry["id"])
+def test_corpus_matches_legacy(entry):
+    assert clean_text(entry["text"]) == legacy_clean_text(entry["text"])
+
+
+def test_fuzzed_rule_fragments_match_legacy():
+    mismatches = [text for text in _fuzz_cases() if clean_text(text) != legacy_clean_text(text)]
+    assert mismatches == []
@@ -0,0 +1,71 @@
+import os
+import re
+import json
+
+# ✅ 정제 규칙 파일 (규칙 추가/수정은 JSON 만 고치면 됨)
+# - steps: 파일 순서대로 실행하는 단계 목록 (기존 구현과 출력이 같도록 전화번호는 이모지보다 먼저 지움)
+# - delete_chars 단계: 지울 문자 범위 (16진수 코드포인트 [시작, 끝]) → str.translate 한 번으로 삭제
+# - remove_patterns 단계: 지울 문구 정규식 → 미리 컴파일해서 규칙 순서대로 하나씩 삭제 (대소문자 무시)
+#   (규칙끼리 겹치는 문구가 있어 alternation 한 번으로 합치면 기존 구현과 결과가 달라짐)
+TEXT_CLEANING_RULES_PATH = os.getenv(
+    "TEXT_CLEANING_RULES_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "text_cleaning_rules.json"),
+)
+
+
+def load_rules(path=TEXT_CLEANING_RULES_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_delete_table(groups):
+    table = {}
+    for group in groups:
+        for start, end in group["ranges"]:
+            for code in range(int(start, 16), int(end, 16) + 1):
+                table[code] = None
+    return table
+
+
+def build_remove_patterns(patterns):
+    return [re.compile(rule["pattern"], flags=re.IGNORECASE) for rule in patterns]
+
+
+def build_steps(rules):
+    steps = []
+    for step in rules["steps"]:
+        if step.get("delete_chars"):
+            steps.append(("delete", build_delete_table(step["delete_chars"])))
+        elif step.get("remove_patterns"):
+            steps.extend(("remove", pattern) for pattern in build_remove_patterns(step["remove_patterns"]))
+    return steps
+
+
+class TextCleaner:
+    """
+    미리 컴파일한 규칙으로 본문 정제
+    - 공백 정리 → 단계별 지울 문자 삭제(translate) / 지울 문구 삭제(규칙마다 sub 한 번) → 앞뒤 공백 제거
+    - 단계 순서와 단계 안의 규칙 순서는 JSON 파일 순서 (기존 re.sub 연쇄와 같은 순서)
+    """
+
+    def __init__(self, rules):
+        self.steps = build_steps(rules)
+
+    def clean(self, text):
+        text = " ".join(text.split())
+        for kind, rule in self.steps:
+            text = text.translate(rule) if kind == "delete" else rule.sub("", text)
+        return text.strip()
+
+
+_cleaner = TextCleaner(load_rules())
+
+
+# ✅ 정제 함수 (본문용)
+def clean_text(text):
+    return _cleaner.clean(text)
+
+
+# ✅ 본문 + OCR 텍스트 통합 (공백 정리)
+def preprocess_text(main_text, ocr_text):
+    return " ".join(f"{main_text}\n{ocr_text}".split())
@@ -0,0 +1,31 @@
+import re
+
+# ✅ 주소 패턴 (extract_info.extract_location_info 와 동일)
+ADDRESS_PATTERN = re.compile(r'(서울|부산|대전|광주|대구|인천|수원|제주|경기|강원|충북|충남|전북|전남|경북|경남)[^, \n]{2,}')
+
+# ✅ 촬영 장소 언급 키워드
+LOCATION_KEYWORDS = ["촬영", "장면", "배경", "등장", "성지순례", "찍은", "나온"]
+
+ADDRESS_WEIGHT = 3
+KEYWORD_WEIGHT = 2
+NER_LOC_WEIGHT = 1
+
+
+def count_addresses(text):
+    return sum(1 for _ in ADDRESS_PATTERN.finditer(text))
+
+
+def count_location_keywords(text):
+    return sum(text.count(keyword) for keyword in LOCATION_KEYWORDS)
+
+
+def location_score(text, loc_count=0):
+    """
+    텍스트의 장소 관련성 점수
+    - 주소 패턴 매치, 촬영/장면 키워드, NER LOC 개체 수(loc_count)에 가중치를 곱해 합산
+    """
+    return (
+        ADDRESS_WEIGHT * count_addresses(text)
+        + KEYWORD_WEIGHT * count_location_keywords(text)
+        + NER_LOC_WEIGHT * loc_count
+    )
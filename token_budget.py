@@ -0,0 +1,128 @@
+import os
+import re
+import threading
+
+from text_signals import location_score
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 글자 수로 보수적으로 추정
+    tiktoken = None
+
+# ✅ 토큰 예산 설정
+GPT_MODEL = os.getenv("GPT_MODEL", "gpt-4o")
+# "chars" 이면 tiktoken 을 쓰지 않고 글자 수로 추정 (BPE 파일을 받을 수 없는 오프라인 환경용)
+TOKEN_COUNTER = os.getenv("TOKEN_COUNTER", "tiktoken")
+BLOG_TOKEN_BUDGET = int(os.getenv("BLOG_TOKEN_BUDGET", "3000"))
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "300"))
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?。])\s+|(?<=다\.)|(?<=요\.)")
+
+_UNAVAILABLE = object()  # 인코딩 로딩 실패 표시 (다시 시도하지 않음)
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _load_encoding():
+    if tiktoken is None or TOKEN_COUNTER == "chars":
+        return _UNAVAILABLE
+    try:
+        try:
+            return tiktoken.encoding_for_model(GPT_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:  # BPE 파일 다운로드 실패 등
+        print(f"[TOKEN] tiktoken 인코딩 로딩 실패 → 글자 수로 추정 ({e})")
+        return _UNAVAILABLE
+
+
+# ✅ 인코딩은 프로세스에서 한 번만 로딩 (실패도 기억해서 매 호출마다 다운로드를 다시 시도하지 않음) → 없으면 None
+def _get_encoding():
+    global _encoding
+    if _encoding is None:
+        with _encoding_lock:
+            if _encoding is None:
+                _encoding = _load_encoding()
+    return None if _encoding is _UNAVAILABLE else _encoding
+
+
+# ✅ 토큰 수 계산 (tiktoken 없거나 인코딩을 못 불러오면 한국어 기준 글자 수로 추정)
+def count_tokens(text):
+    encoding = _get_encoding()
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def _sentences(text, chunk_tokens):
+    for sentence in SENTENCE_SPLIT.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if count_tokens(sentence) <= chunk_tokens:
+            yield sentence
+            continue
+        # 문장부호 없이 긴 텍스트는 글자 수 기준으로 강제로 자름
+        for start in range(0, len(sentence), chunk_tokens):
+            yield sentence[start:start + chunk_tokens]
+
+
+# ✅ 문장 단위로 잘라 chunk_tokens 이하의 청크로 묶기
+def split_into_chunks(text, chunk_tokens=CHUNK_TOKENS):
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence in _sentences(text, chunk_tokens):
+        tokens = count_tokens(sentence)
+        if current and current_tokens + tokens > chunk_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def select_relevant_text(text, budget=BLOG_TOKEN_BUDGET, loc_counts=None):
+    """
+    예산 안에서 장소 관련성이 높은 청크만 골라 원래 순서대로 이어붙임 → (선택 텍스트, 원래 토큰 수, 선택 토큰 수)
+    - 점수가 있는 청크와 그 바로 앞뒤 청크(맥락)만 후보로 사용
+    - 점수가 있는 청크가 하나도 없으면 앞에서부터 예산만큼 사용
+    - loc_counts: 청크별 NER LOC 개체 수 (없으면 주소 패턴/키워드만 사용)
+    """
+    total_tokens = count_tokens(text)
+    chunks = split_into_chunks(text)
+    if not chunks:
+        return "", total_tokens, 0
+
+    chunk_tokens = [count_tokens(chunk) for chunk in chunks]
+    scores = [
+        location_score(chunk, loc_counts[i] if loc_counts else 0)
+        for i, chunk in enumerate(chunks)
+    ]
+
+    if any(scores):
+        # 이웃 청크는 자기 점수 대신 이웃 점수의 절반으로 순위 매김
+        candidates = {}
+        for i, score in enumerate(scores):
+            if not score:
+                continue
+            candidates[i] = max(candidates.get(i, 0), score)
+            for j in (i - 1, i + 1):
+                if 0 <= j < len(chunks):
+                    candidates[j] = max(candidates.get(j, 0), scores[j] or score / 2)
+        ranked = sorted(candidates, key=lambda i: (-candidates[i], i))
+    else:
+        ranked = list(range(len(chunks)))
+
+    selected = []
+    used = 0
+    for i in ranked:
+        if used + chunk_tokens[i] > budget:
+            continue
+        selected.append(i)
+        used += chunk_tokens[i]
+
+    selected.sort()
+    return " ".join(chunks[i] for i in selected), total_tokens, used